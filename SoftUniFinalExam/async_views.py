@@ -0,0 +1,45 @@
+from django.http import Http404
+from django.utils.translation import gettext as _
+from django.views.generic import DetailView, ListView
+
+
+class AsyncListView(ListView):
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        context = await self.aget_context_data()
+        return self.render_to_response(context)
+
+    async def aget_context_data(self, **kwargs):
+        return self.get_context_data(**kwargs)
+
+
+class AsyncDetailView(DetailView):
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = await self.aget_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        if pk is None and slug is None:
+            raise AttributeError(
+                f"Generic detail view {self.__class__.__name__} must be called with either an object pk or a slug in the URLconf."
+            )
+
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(_("No %(verbose_name)s found matching the query") % {
+                'verbose_name': queryset.model._meta.verbose_name
+            })
+
+    async def aget_context_data(self, **kwargs):
+        return self.get_context_data(**kwargs)
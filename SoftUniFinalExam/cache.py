@@ -0,0 +1,43 @@
+from django.core.cache.backends import filebased, locmem, redis
+from django.core.cache.backends.base import BaseCache
+
+from SoftUniFinalExam.metrics import registry
+
+_missing = object()
+
+
+class InstrumentedCacheMixin:
+    def record(self, hits, misses):
+        backend = type(self).__name__
+        if hits:
+            registry.inc('cache_requests_total', {'backend': backend, 'result': 'hit'}, hits)
+        if misses:
+            registry.inc('cache_requests_total', {'backend': backend, 'result': 'miss'}, misses)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version)
+        if value is _missing:
+            self.record(0, 1)
+            return default
+
+        self.record(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        if self.get_many_is_native:
+            self.record(len(values), len(keys) - len(values))
+        return values
+
+
+class LocMemCache(InstrumentedCacheMixin, locmem.LocMemCache):
+    get_many_is_native = locmem.LocMemCache.get_many is not BaseCache.get_many
+
+
+class FileBasedCache(InstrumentedCacheMixin, filebased.FileBasedCache):
+    get_many_is_native = filebased.FileBasedCache.get_many is not BaseCache.get_many
+
+
+class RedisCache(InstrumentedCacheMixin, redis.RedisCache):
+    get_many_is_native = redis.RedisCache.get_many is not BaseCache.get_many
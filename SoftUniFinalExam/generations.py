@@ -0,0 +1,29 @@
+import time
+
+from django.core.cache import cache
+
+GENERATION_KEY = 'generation:{}'
+
+
+def _initial_generation():
+    return int(time.time() * 1000)
+
+
+def get_generation(label):
+    key = GENERATION_KEY.format(label)
+    generation = cache.get(key)
+
+    if generation is None:
+        cache.add(key, _initial_generation(), None)
+        generation = cache.get(key)
+
+    return generation
+
+
+def bump_generation(label):
+    key = GENERATION_KEY.format(label)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_generation(), None)
@@ -0,0 +1,48 @@
+import json
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+VARIANTS_DIR = 'images/variants'
+MANIFEST_NAME = f'{VARIANTS_DIR}/manifest.json'
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+_manifest = {}
+
+
+def variants_root():
+    return os.path.join(settings.STATICFILES_DIRS[0], VARIANTS_DIR)
+
+
+def variant_name(path, width, image_format):
+    stem, extension = os.path.splitext(os.path.basename(path))
+    return f'{VARIANTS_DIR}/{stem}-{extension.lstrip(".")}-{width}.{image_format}'
+
+
+def reset_manifest():
+    _manifest.clear()
+
+
+def load_manifest():
+    # Outside DEBUG the manifest only changes with a deploy, so it is found and read once per process.
+    if 'entries' in _manifest and not settings.DEBUG:
+        return _manifest['entries']
+
+    if not _manifest.get('path'):
+        _manifest['path'] = finders.find(MANIFEST_NAME)
+    path = _manifest['path']
+    if not path:
+        _manifest['entries'] = {}
+        return _manifest['entries']
+
+    mtime = os.path.getmtime(path)
+    if _manifest.get('mtime') != mtime:
+        with open(path) as manifest_file:
+            _manifest['entries'] = json.load(manifest_file)
+        _manifest['mtime'] = mtime
+    return _manifest['entries']
+
+
+def get_variants(path):
+    return load_manifest().get(path)
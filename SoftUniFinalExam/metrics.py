@@ -0,0 +1,224 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import suppress
+
+from django.conf import settings
+
+from SoftUniFinalExam.pooled_postgresql.base import pool_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SESSION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+METRICS = {
+    'http_request_duration_seconds': ('histogram', "Request latency by route.", LATENCY_BUCKETS),
+    'http_request_queries': ('histogram', "Database queries per request by route.", QUERY_BUCKETS),
+    'http_requests_total': ('counter', "Requests by route, method and status class.", None),
+    'cache_requests_total': ('counter', "Cache lookups by backend and result.", None),
+    'session_operation_duration_seconds': ('histogram', "Session load and save time.", SESSION_BUCKETS),
+    'login_attempts_total': ('counter', "Password checks by result.", None),
+    'login_throttled_total': ('counter', "Login attempts rejected before authentication, by scope.", None),
+    'db_pool_connections': ('gauge', "Pooled database connections by state.", None),
+    'db_pool_events_total': ('counter', "Connection pool checkouts, waits, timeouts and reconnects.", None),
+}
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.collectors = []
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.last_flush = 0.0
+
+    def ensure_process(self):
+        if self.pid != os.getpid():
+            self.reset()
+
+    def inc(self, name, labels, amount=1):
+        key = (name, _labels_key(labels))
+        with self.lock:
+            self.ensure_process()
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, _labels_key(labels))
+        with self.lock:
+            self.ensure_process()
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            histogram['buckets'][bisect_left(buckets, value)] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def collect(self):
+        gauges = {}
+        totals = {}
+        for collector in self.collectors:
+            for kind, name, labels, value in collector():
+                target = gauges if kind == 'gauge' else totals
+                target[(name, _labels_key(labels))] = value
+
+        with self.lock:
+            self.ensure_process()
+            self.gauges = gauges
+            self.counters.update(totals)
+
+    def snapshot(self):
+        self.collect()
+        with self.lock:
+            return {
+                'pid': self.pid,
+                'written': time.time(),
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, labels, dict(value, buckets=list(value['buckets']))]
+                               for (name, labels), value in self.histograms.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in self.gauges.items()],
+            }
+
+    def flush(self, force=False):
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+
+        now = time.monotonic()
+        with self.lock:
+            self.ensure_process()
+            if not force and now - self.last_flush < settings.METRICS_FLUSH_INTERVAL:
+                return
+            self.last_flush = now
+
+        snapshot = self.snapshot()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{snapshot['pid']}.json")
+        # Each flush gets its own temporary file, so a concurrent flush can never rename it away.
+        descriptor, temporary = tempfile.mkstemp(prefix=f"{snapshot['pid']}-", suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'w') as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+            os.replace(temporary, path)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(temporary)
+            raise
+
+    def snapshots(self):
+        if not settings.METRICS_DIR:
+            return [self.snapshot()]
+
+        self.flush(force=True)
+        snapshots = []
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.json')):
+            try:
+                with open(path) as snapshot_file:
+                    snapshots.append(json.load(snapshot_file))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+
+def merge(snapshots, gauge_max_age):
+    counters = {}
+    histograms = {}
+    gauges = {}
+    now = time.time()
+
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+
+        for name, labels, value in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, {'buckets': [0] * len(value['buckets']), 'sum': 0.0, 'count': 0})
+            merged['buckets'] = [left + right for left, right in zip(merged['buckets'], value['buckets'])]
+            merged['sum'] += value['sum']
+            merged['count'] += value['count']
+
+        if now - snapshot['written'] > gauge_max_age:
+            continue
+        for name, labels, value in snapshot['gauges']:
+            labels = tuple(sorted([*map(tuple, labels), ('pid', str(snapshot['pid']))]))
+            gauges[(name, labels)] = value
+
+    return counters, histograms, gauges
+
+
+def render(snapshots, gauge_max_age=300):
+    counters, histograms, gauges = merge(snapshots, gauge_max_age)
+    series = {}
+    for source in (counters, histograms, gauges):
+        for (name, labels), value in source.items():
+            series.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        if name not in series:
+            continue
+
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(series[name], key=lambda item: item[0]):
+            if kind != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                continue
+
+            cumulative = 0
+            for bound, count in zip((*buckets, float('inf')), value['buckets']):
+                cumulative += count
+                bucket_labels = (*labels, ('le', _format_value(float(bound))))
+                lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value["sum"])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def pool_metrics():
+    if settings.DB_CONN_MODE != 'pool':
+        return
+
+    for stats in pool_stats():
+        alias = stats['alias']
+        for state in ('idle', 'in_use'):
+            yield 'gauge', 'db_pool_connections', {'alias': alias, 'state': state}, stats[state]
+        for event in ('checkouts', 'waits', 'timeouts', 'reconnects'):
+            yield 'counter', 'db_pool_events_total', {'alias': alias, 'event': event}, stats.get(event, 0)
+
+
+registry.collectors.append(pool_metrics)
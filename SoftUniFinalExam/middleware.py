@@ -0,0 +1,188 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.template.loader import render_to_string
+from django.utils.module_loading import import_string
+
+from SoftUniFinalExam import timing
+from SoftUniFinalExam.metrics import registry
+from users import urls as user_urls
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.budgets = import_string(settings.QUERY_BUDGETS)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with timing.timed_request(detailed=False) as timer:
+            queries = timer.queries
+            response = self.get_response(request)
+
+        self.check_budget(request, timer.queries - queries)
+        return response
+
+    async def __acall__(self, request):
+        with timing.timed_request(detailed=False) as timer:
+            queries = timer.queries
+            response = await self.get_response(request)
+
+        self.check_budget(request, timer.queries - queries)
+        return response
+
+    def check_budget(self, request, queries):
+        match = request.resolver_match
+        budget = self.budgets.get(match.url_name) if match else None
+        if budget is not None and queries > budget:
+            message = f"{match.url_name} ran {queries} queries, budget is {budget}."
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not timing.should_sample():
+            return self.get_response(request)
+
+        with timing.timed_request() as timer:
+            response = self.get_response(request)
+
+        response['Server-Timing'] = timer.header()
+        if self.wants_footer(response) and timing.is_timing_viewer(getattr(request, 'user', None)):
+            self.add_footer(response, timer)
+        return response
+
+    async def __acall__(self, request):
+        if not timing.should_sample():
+            return await self.get_response(request)
+
+        with timing.timed_request() as timer:
+            response = await self.get_response(request)
+
+        response['Server-Timing'] = timer.header()
+        if self.wants_footer(response):
+            if await sync_to_async(timing.is_timing_viewer)(getattr(request, 'user', None)):
+                self.add_footer(response, timer)
+        return response
+
+    def wants_footer(self, response):
+        return (
+            settings.SERVER_TIMING_FOOTER
+            and not response.streaming
+            and response.status_code == 200
+            and response.get('Content-Type', '').startswith('text/html')
+        )
+
+    def add_footer(self, response, timer):
+        footer = render_to_string('partials/server_timing.html', {'metrics': [
+            (name, duration * 1000, description) for name, duration, description in timer.metrics()
+        ]})
+        content = response.content.decode(response.charset)
+        position = content.rfind('</body>')
+        if position == -1:
+            return
+
+        response.content = content[:position] + footer + content[position:]
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.routes = {pattern.name for pattern in user_urls.urlpatterns if pattern.name}
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        with timing.timed_request(detailed=False) as timer:
+            queries = timer.queries
+            response = self.get_response(request)
+
+        self.record(request, response, time.perf_counter() - started, timer.queries - queries)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with timing.timed_request(detailed=False) as timer:
+            queries = timer.queries
+            response = await self.get_response(request)
+
+        self.record(request, response, time.perf_counter() - started, timer.queries - queries)
+        return response
+
+    def record(self, request, response, duration, queries):
+        match = request.resolver_match
+        route = match.url_name if match and match.url_name in self.routes else 'other'
+
+        registry.observe('http_request_duration_seconds', {'route': route}, duration)
+        registry.observe('http_request_queries', {'route': route}, queries)
+        registry.inc('http_requests_total', {
+            'route': route,
+            'method': request.method,
+            'status': f'{response.status_code // 100}xx',
+        })
+        try:
+            registry.flush()
+        except Exception:
+            logger.exception("Could not write the metrics snapshot.")
+
+
+class TimedSessionStoreMixin:
+    def load(self):
+        started = time.perf_counter()
+        try:
+            return super().load()
+        finally:
+            registry.observe('session_operation_duration_seconds', {'operation': 'load'}, time.perf_counter() - started)
+
+    def save(self, must_create=False):
+        started = time.perf_counter()
+        try:
+            return super().save(must_create)
+        finally:
+            registry.observe('session_operation_duration_seconds', {'operation': 'save'}, time.perf_counter() - started)
+
+
+class TimedSessionMiddleware(SessionMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        store = self.SessionStore
+        # Keep the original qualname: session signatures are salted with it.
+        self.SessionStore = type(store.__name__, (TimedSessionStoreMixin, store), {'__qualname__': store.__qualname__})
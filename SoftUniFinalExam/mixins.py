@@ -1,3 +1,8 @@
+from django.db import router, transaction
+
+from SoftUniFinalExam.slugs import reserve_slugs
+
+
 class ReadOnlyMixin:
     readonly_fields = []
 
@@ -18,4 +23,17 @@ class PlaceholderMixin:
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.add_placeholder()
\ No newline at end of file
+        self.add_placeholder()
+
+
+class UniqueSlugMixin:
+    slug_source = 'title'
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            self.slug = reserve_slugs(type(self), [getattr(self, self.slug_source)], using=using)[0]
+            super().save(*args, **kwargs)
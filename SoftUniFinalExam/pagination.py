@@ -0,0 +1,163 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+DEFAULT_PAGE_SIZE = 12
+MAX_PAGE_SIZE = 48
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _field_names(ordering):
+    return [field.lstrip('-') for field in ordering]
+
+
+def encode_cursor(obj, ordering):
+    values = []
+    for name in _field_names(ordering):
+        value = getattr(obj, name)
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, ValueError):
+        raise Http404("Invalid page cursor.")
+
+    names = _field_names(ordering)
+    if not isinstance(values, list) or len(values) != len(names):
+        raise Http404("Invalid page cursor.")
+    if not all(isinstance(value, (str, int, float)) for value in values):
+        raise Http404("Invalid page cursor.")
+
+    try:
+        return [model._meta.get_field(name).to_python(value) for name, value in zip(names, values)]
+    except (ValidationError, TypeError, ValueError):
+        raise Http404("Invalid page cursor.")
+
+
+def keyset_filter(ordering, values, reverse=False):
+    condition = Q()
+    equal = {}
+
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        descending = field.startswith('-') != reverse
+        lookup = 'lt' if descending else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+
+    return condition
+
+
+def reverse_ordering(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def _keyset_rows(queryset, ordering, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    model = queryset.model
+
+    if before:
+        values = decode_cursor(before, model, ordering)
+        return (
+            queryset.filter(keyset_filter(ordering, values, reverse=True))
+            .order_by(*reverse_ordering(ordering))[:page_size + 1]
+        )
+
+    if after:
+        values = decode_cursor(after, model, ordering)
+        queryset = queryset.filter(keyset_filter(ordering, values))
+    return queryset.order_by(*ordering)[:page_size + 1]
+
+
+def _keyset_page(rows, ordering, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    if before:
+        has_previous = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next = True
+    else:
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_previous = bool(after)
+
+    if not rows:
+        return KeysetPage(rows)
+
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1], ordering) if has_next else None,
+        previous_cursor=encode_cursor(rows[0], ordering) if has_previous else None,
+    )
+
+
+def paginate_keyset(queryset, ordering, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    rows = list(_keyset_rows(queryset, ordering, after, before, page_size))
+    return _keyset_page(rows, ordering, after, before, page_size)
+
+
+async def apaginate_keyset(queryset, ordering, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    rows = [row async for row in _keyset_rows(queryset, ordering, after, before, page_size)]
+    return _keyset_page(rows, ordering, after, before, page_size)
+
+
+class KeysetPaginationMixin:
+    keyset_ordering = ('-id',)
+    page_size = DEFAULT_PAGE_SIZE
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_page_size(self):
+        try:
+            page_size = int(self.request.GET.get('page_size', self.page_size))
+        except ValueError:
+            page_size = self.page_size
+
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_page_kwargs(self):
+        return {
+            'after': self.request.GET.get('after'),
+            'before': self.request.GET.get('before'),
+            'page_size': self.get_page_size(),
+        }
+
+    def get_context_data(self, **kwargs):
+        page = paginate_keyset(self.object_list, self.keyset_ordering, **self.get_page_kwargs())
+        return self.get_page_context_data(page, **kwargs)
+
+    async def aget_context_data(self, **kwargs):
+        page = await apaginate_keyset(self.object_list, self.keyset_ordering, **self.get_page_kwargs())
+        return self.get_page_context_data(page, **kwargs)
+
+    def get_page_context_data(self, page, **kwargs):
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context['page_obj'] = page
+        context['is_paginated'] = page.has_next or page.has_previous
+        return context
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+
+from django.db.backends.postgresql import base
+from psycopg2 import OperationalError, extensions
+
+DEFAULT_POOL = {
+    'MAX_SIZE': 10,
+    'TIMEOUT': 5,
+    'CHECK_AFTER': 30,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    def __init__(self, alias, max_size, timeout, check_after):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+        self.idle = []
+        self.size = 0
+        self.counters = dict.fromkeys(
+            ('checkouts', 'waits', 'timeouts', 'created', 'reconnects', 'discarded'), 0
+        )
+        self.wait_seconds = 0.0
+
+    def acquire(self, connect):
+        with self.condition:
+            self.counters['checkouts'] += 1
+            if not self.idle and self.size >= self.max_size:
+                self.wait_for_connection()
+
+            if self.idle:
+                connection, released_at = self.idle.pop()
+            else:
+                self.size += 1
+                connection = released_at = None
+
+        try:
+            if connection is None:
+                connection = connect()
+                self.count('created')
+            elif not self.is_healthy(connection, released_at):
+                connection.close()
+                connection = connect()
+                self.count('reconnects')
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+
+        return connection
+
+    def wait_for_connection(self):
+        self.counters['waits'] += 1
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while not self.idle and self.size >= self.max_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.counters['timeouts'] += 1
+                self.wait_seconds += time.monotonic() - started
+                raise OperationalError(
+                    f"Timed out after {self.timeout}s waiting for a connection from the '{self.alias}' pool."
+                )
+            self.condition.wait(remaining)
+
+        self.wait_seconds += time.monotonic() - started
+
+    def is_healthy(self, connection, released_at):
+        if connection.closed:
+            return False
+        if time.monotonic() - released_at < self.check_after:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Exception:
+            return False
+        return True
+
+    def release(self, connection):
+        reusable = not connection.closed
+        if reusable and connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                reusable = False
+
+        with self.condition:
+            if reusable:
+                self.idle.append((connection, time.monotonic()))
+            else:
+                self.size -= 1
+                self.counters['discarded'] += 1
+            self.condition.notify()
+
+        if not reusable:
+            connection.close()
+
+    def count(self, name):
+        with self.condition:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self.condition:
+            return {
+                'alias': self.alias,
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'wait_seconds': round(self.wait_seconds, 6),
+                **self.counters,
+            }
+
+
+def get_pool(alias, settings_dict):
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None or pool.pid != os.getpid():
+            options = {**DEFAULT_POOL, **settings_dict.get('POOL', {})}
+            pool = _pools[alias] = ConnectionPool(
+                alias,
+                max_size=options['MAX_SIZE'],
+                timeout=options['TIMEOUT'],
+                check_after=options['CHECK_AFTER'],
+            )
+        return pool
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools if pool.pid == os.getpid()]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        return get_pool(self.alias, self.settings_dict).acquire(lambda: connect(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                get_pool(self.alias, self.settings_dict).release(self.connection)
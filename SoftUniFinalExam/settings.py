@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os.path
 from pathlib import Path
-from decouple import config
+from decouple import Choices, Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,12 +42,17 @@ INSTALLED_APPS = [
     'posts.apps.PostsConfig',
     'clubs.apps.ClubsConfig',
     'competitions.apps.CompetitionsConfig',
-    'registration.apps.RegistrationConfig'
+    'registration.apps.RegistrationConfig',
+    'search.apps.SearchConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'SoftUniFinalExam.middleware.ServerTimingMiddleware',
+    'SoftUniFinalExam.middleware.MetricsMiddleware',
+    'SoftUniFinalExam.middleware.QueryBudgetMiddleware',
+    'SoftUniFinalExam.routers.ReplicaStickinessMiddleware',
+    'SoftUniFinalExam.middleware.TimedSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -59,7 +64,7 @@ ROOT_URLCONF = 'SoftUniFinalExam.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'SoftUniFinalExam.timing.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates']
         ,
         'APP_DIRS': True,
@@ -76,6 +81,28 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'SoftUniFinalExam.wsgi.application'
 
+# Per-view query budgets, declared next to the routes they cover
+QUERY_BUDGETS = 'users.urls.QUERY_BUDGETS'
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=DEBUG, cast=bool)
+
+# Fraction of requests that get a Server-Timing header; staff also get a footer
+SERVER_TIMING_SAMPLE_RATE = config('SERVER_TIMING_SAMPLE_RATE', default=1.0 if DEBUG else 0.05, cast=float)
+SERVER_TIMING_FOOTER = config('SERVER_TIMING_FOOTER', default=True, cast=bool)
+
+# Aggregated metrics; set METRICS_DIR when running several worker processes
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=float)
+METRICS_GAUGE_MAX_AGE = config('METRICS_GAUGE_MAX_AGE', default=300, cast=float)
+
+# Sliding-window login throttling, kept in the default cache
+LOGIN_THROTTLE_ENABLED = config('LOGIN_THROTTLE_ENABLED', default=True, cast=bool)
+LOGIN_THROTTLE_WINDOW = config('LOGIN_THROTTLE_WINDOW', default=300, cast=int)
+LOGIN_THROTTLE_IP_LIMIT = config('LOGIN_THROTTLE_IP_LIMIT', default=30, cast=int)
+LOGIN_THROTTLE_USERNAME_LIMIT = config('LOGIN_THROTTLE_USERNAME_LIMIT', default=5, cast=int)
+LOGIN_THROTTLE_IP_HEADER = config('LOGIN_THROTTLE_IP_HEADER', default='REMOTE_ADDR')
+LOGIN_THROTTLE_TRUSTED_PROXIES = config('LOGIN_THROTTLE_TRUSTED_PROXIES', default=1, cast=int)
+LOGIN_LOCKOUT_SECONDS = config('LOGIN_LOCKOUT_SECONDS', default=900, cast=int)
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -91,6 +118,63 @@ DATABASES = {
     }
 }
 
+DB_CONN_MODE = config('DB_CONN_MODE', default='persistent', cast=Choices(['none', 'persistent', 'pool']))
+
+if DB_CONN_MODE == 'persistent':
+    DATABASES['default'].update({
+        "CONN_MAX_AGE": config('DB_CONN_MAX_AGE', default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+    })
+elif DB_CONN_MODE == 'pool':
+    DATABASES['default'].update({
+        "ENGINE": "SoftUniFinalExam.pooled_postgresql",
+        "POOL": {
+            "MAX_SIZE": config('DB_POOL_SIZE', default=10, cast=int),
+            "TIMEOUT": config('DB_POOL_TIMEOUT', default=5, cast=float),
+            "CHECK_AFTER": config('DB_POOL_CHECK_AFTER', default=30, cast=float),
+        },
+    })
+
+for number, replica in enumerate(config('DB_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        "HOST": host,
+        "PORT": port or DATABASES['default']['PORT'],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica_')]
+DATABASE_ROUTERS = ['SoftUniFinalExam.routers.ReplicaRouter']
+REPLICA_STICKY_SECONDS = config('DB_REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHE_BACKENDS = {
+    'locmem': 'SoftUniFinalExam.cache.LocMemCache',
+    'file': 'SoftUniFinalExam.cache.FileBasedCache',
+    'redis': 'SoftUniFinalExam.cache.RedisCache',
+}
+CACHE_LOCATIONS = {
+    'locmem': 'malambo',
+    'file': '/var/tmp/malambo_cache',
+    'redis': 'redis://127.0.0.1:6379/1',
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem', cast=Choices(list(CACHE_BACKENDS)))
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': config('CACHE_LOCATION', default=CACHE_LOCATIONS[CACHE_BACKEND]),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'KEY_PREFIX': config('CACHE_KEY_PREFIX', default='malambo'),
+    }
+}
+
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
+
 
 
 # Password validation
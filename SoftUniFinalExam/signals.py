@@ -1,10 +1,28 @@
-from django.db.models.signals import post_save
+from django.db.backends.signals import connection_created
+from django.core.signals import setting_changed
+from django.db.models.signals import post_init, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+
+from SoftUniFinalExam.generations import bump_generation
+from SoftUniFinalExam.images import reset_manifest
+from SoftUniFinalExam.similarity import remove_terms, update_related
+from SoftUniFinalExam.timing import install_query_timer
+from clubs.models import Club
+from competitions.models import Competitions
+from posts.models import Post
+from search.backends import index_object, remove_object
 from users.models import Users
+from users.profile_sync import remember_mirrored, sync_profile
+from users.roles import invalidate_user_roles
+
+@receiver(post_init, sender=User)
+def remember_mirrored_fields(sender, instance, **kwargs):
+    remember_mirrored(instance)
+
 
 @receiver(post_save, sender=User)
-def create_or_update_users(sender, instance, created, **kwargs):
+def create_or_update_users(sender, instance, created, update_fields=None, **kwargs):
     if created:
         Users.objects.create(
             user=instance,
@@ -13,11 +31,77 @@ def create_or_update_users(sender, instance, created, **kwargs):
             last_name=instance.last_name,
             email=instance.email
         )
+        remember_mirrored(instance)
     else:
-        user_profile = Users.objects.filter(user=instance).first()
-        if user_profile:
-            user_profile.username = instance.username
-            user_profile.first_name = instance.first_name
-            user_profile.last_name = instance.last_name
-            user_profile.email = instance.email
-            user_profile.save()
+        sync_profile(instance, update_fields)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_user_roles(instance)
+        return
+
+    if action == 'pre_clear':
+        pk_set = instance.user_set.values_list('pk', flat=True)
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    for user_id in pk_set:
+        invalidate_user_roles(user_id)
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Club)
+@receiver([post_save, post_delete], sender=Competitions)
+@receiver([post_save, post_delete], sender=Users)
+def bump_model_generation(sender, **kwargs):
+    bump_generation(sender._meta.label_lower)
+
+
+@receiver(m2m_changed, sender=Club.members.through)
+@receiver(m2m_changed, sender=Competitions.participants.through)
+def bump_generation_on_m2m_change(sender, instance, action, model, reverse, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        owner = model if reverse else type(instance)
+        bump_generation(owner._meta.label_lower)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Club)
+@receiver(post_save, sender=Competitions)
+def update_similarity_index(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields and not set(update_fields) & set(sender.similarity_fields):
+        return
+
+    update_related(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Club)
+@receiver(post_save, sender=Competitions)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_object(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Club)
+@receiver(post_delete, sender=Competitions)
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_object(instance)
+    remove_terms(instance)
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    install_query_timer(connection)
+
+
+@receiver(setting_changed)
+def reset_image_manifest(setting, **kwargs):
+    if setting in ('STATICFILES_DIRS', 'DEBUG'):
+        reset_manifest()
@@ -0,0 +1,168 @@
+import math
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from search.models import SimilarityTerm
+
+TOP_K = 4
+BATCH_SIZE = 500
+MAX_TERM_LENGTH = 100
+TOKEN_RE = re.compile(r'\w{3,}')
+STOP_WORDS = frozenset({
+    'and', 'are', 'but', 'for', 'from', 'has', 'have', 'her', 'his', 'its', 'not', 'our', 'that', 'the',
+    'their', 'them', 'they', 'this', 'was', 'were', 'will', 'with', 'you', 'your',
+})
+
+
+def tokenize(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def _chunks(items, size=BATCH_SIZE):
+    items = sorted(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def weigh(counts, document_frequency, total):
+    weights = {
+        term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+        for term, count in counts.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+    return {term: weight / norm for term, weight in weights.items()}
+
+
+def build_vectors(documents):
+    document_frequency = Counter()
+    for tokens in documents.values():
+        document_frequency.update(set(tokens))
+
+    total = len(documents)
+    return {pk: weigh(Counter(tokens), document_frequency, total) for pk, tokens in documents.items()}
+
+
+def cosine(first, second):
+    if len(first) > len(second):
+        first, second = second, first
+    return sum(weight * second.get(term, 0.0) for term, weight in first.items())
+
+
+def _top_neighbours(scores):
+    ranked = sorted(((pk, score) for pk, score in scores.items() if score > 0), key=lambda item: (-item[1], item[0]))
+    return [[pk, round(score, 4)] for pk, score in ranked[:TOP_K]]
+
+
+def _load(model, fields):
+    documents = {}
+    related = {}
+    for pk, current, *texts in model.objects.values_list('pk', 'related', *fields).iterator():
+        documents[pk] = tokenize(' '.join(texts))
+        related[pk] = current or []
+    return documents, related
+
+
+def _postings(term_model, kind, vectors):
+    return [
+        term_model(kind=kind, object_id=pk, term=term, weight=weight)
+        for pk, vector in vectors.items()
+        for term, weight in vector.items()
+    ]
+
+
+def update_related(instance, fields=None):
+    model = type(instance)
+    fields = fields or model.similarity_fields
+    kind = model._meta.label_lower
+    postings = SimilarityTerm.objects.filter(kind=kind)
+    counts = Counter(tokenize(' '.join(getattr(instance, field) for field in fields)))
+
+    with transaction.atomic():
+        old_terms = set(postings.filter(object_id=instance.pk).values_list('term', flat=True))
+        postings.filter(object_id=instance.pk).delete()
+
+        document_frequency = Counter(counts.keys())
+        for terms in _chunks(counts):
+            document_frequency.update(dict(
+                postings.filter(term__in=terms).values_list('term').annotate(documents=Count('id')).order_by()
+            ))
+        vector = weigh(counts, document_frequency, model.objects.count())
+        SimilarityTerm.objects.bulk_create(_postings(SimilarityTerm, kind, {instance.pk: vector}), batch_size=BATCH_SIZE)
+
+        others = postings.exclude(object_id=instance.pk)
+        scores = Counter()
+        for terms in _chunks(vector):
+            weight = Case(*[When(term=term, then=Value(vector[term])) for term in terms], output_field=FloatField())
+            rows = others.filter(term__in=terms).values('object_id').annotate(score=Sum(F('weight') * weight))
+            scores.update(dict(rows.values_list('object_id', 'score').order_by()))
+
+        # Only rows sharing a term with the old or new text can gain or lose this object as a neighbour.
+        candidates = set(scores)
+        for terms in _chunks(old_terms - set(vector)):
+            candidates.update(others.filter(term__in=terms).values_list('object_id', flat=True).distinct())
+
+        instance.related = _top_neighbours(scores)
+        model.objects.filter(pk=instance.pk).update(related=instance.related)
+
+        changed = []
+        for ids in _chunks(candidates):
+            locked = model.objects.filter(pk__in=ids).order_by('pk').select_for_update()
+            for pk, current in locked.values_list('pk', 'related'):
+                current = current or []
+                neighbours = {other: value for other, value in current if other != instance.pk}
+                if scores[pk] > 0:
+                    neighbours[instance.pk] = scores[pk]
+                updated = _top_neighbours(neighbours)
+                if updated != current:
+                    changed.append(model(pk=pk, related=updated))
+
+        model.objects.bulk_update(changed, ['related'], batch_size=BATCH_SIZE)
+
+
+def remove_terms(instance):
+    SimilarityTerm.objects.filter(kind=type(instance)._meta.label_lower, object_id=instance.pk).delete()
+
+
+def _store_terms(model, vectors, term_model):
+    kind = model._meta.label_lower
+    with transaction.atomic():
+        term_model.objects.filter(kind=kind).delete()
+        term_model.objects.bulk_create(_postings(term_model, kind, vectors), batch_size=BATCH_SIZE)
+
+
+def index_terms(model, fields=None, term_model=SimilarityTerm):
+    documents = _load(model, fields or model.similarity_fields)[0]
+    _store_terms(model, build_vectors(documents), term_model)
+
+
+def rebuild_related(model, fields=None, term_model=None):
+    fields = fields or model.similarity_fields
+
+    documents, related = _load(model, fields)
+    vectors = build_vectors(documents)
+
+    if term_model is not None:
+        _store_terms(model, vectors, term_model)
+
+    changed = []
+    for pk, vector in vectors.items():
+        scores = {other: cosine(vector, other_vector) for other, other_vector in vectors.items() if other != pk}
+        neighbours = _top_neighbours(scores)
+        if neighbours != related[pk]:
+            changed.append(model(pk=pk, related=neighbours))
+
+    model.objects.bulk_update(changed, ['related'], batch_size=BATCH_SIZE)
+    return len(changed)
+
+
+def related_objects(instance):
+    model = type(instance)
+    ids = [pk for pk, score in instance.related]
+    if not ids:
+        return model.objects.none()
+
+    ordering = Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)])
+    return model.objects.filter(pk__in=ids).order_by(ordering)
@@ -0,0 +1,83 @@
+import hashlib
+from collections import Counter
+
+from django.db import connections, router
+from django.utils.text import slugify
+
+SUFFIX_RESERVE = 6
+LOOKUP_CHUNK_SIZE = 500
+PROBE_SIZE = 8
+
+
+def base_slug(model, title):
+    max_length = model._meta.get_field('slug').max_length
+    base = slugify(title)[:max_length - SUFFIX_RESERVE].strip('-')
+    return base or model._meta.model_name
+
+
+def _lock_key(model, base):
+    digest = hashlib.blake2b(f'{model._meta.db_table}:{base}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def lock_slugs(model, bases, using):
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or not connection.in_atomic_block:
+        return
+
+    keys = sorted({_lock_key(model, base) for base in bases})
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(key) FROM unnest(%s::bigint[]) AS key ORDER BY key",
+            [keys]
+        )
+
+
+def suffixed(base, start, stop):
+    return [f'{base}-{suffix}' for suffix in range(start, stop)]
+
+
+def taken_slugs(model, slugs, using):
+    slugs = sorted(set(slugs))
+    taken = set()
+
+    for start in range(0, len(slugs), LOOKUP_CHUNK_SIZE):
+        chunk = slugs[start:start + LOOKUP_CHUNK_SIZE]
+        taken.update(model.objects.using(using).filter(slug__in=chunk).values_list('slug', flat=True))
+
+    return taken
+
+
+def _skip_taken_windows(model, base, start, size, using):
+    # A window whose candidates are all in use costs one COUNT instead of loading its slugs.
+    objects = model.objects.using(using)
+    while objects.filter(slug__in=suffixed(base, start, start + size)).count() == size:
+        start += size
+        size *= 2
+    return start, size
+
+
+def reserve_slugs(model, titles, using=None):
+    using = using or router.db_for_write(model)
+    bases = [base_slug(model, title) for title in titles]
+    wanted = Counter(bases)
+
+    lock_slugs(model, wanted, using)
+
+    # Only the exact candidates are looked up, so an existing "cup-2025" never pushes a new "cup" to "cup-2026".
+    windows = {base: (2, count + PROBE_SIZE) for base, count in wanted.items()}
+    candidates = {base: [base, *suffixed(base, start, start + size)] for base, (start, size) in windows.items()}
+    taken = taken_slugs(model, [slug for slugs in candidates.values() for slug in slugs], using)
+
+    free = {}
+    for base, count in wanted.items():
+        slugs = [slug for slug in candidates[base] if slug not in taken][:count]
+        start, size = windows[base]
+        while len(slugs) < count:
+            start, size = _skip_taken_windows(model, base, start + size, size * 2, using)
+            window = suffixed(base, start, start + size)
+            window_taken = taken_slugs(model, window, using)
+            slugs += [slug for slug in window if slug not in window_taken][:count - len(slugs)]
+        free[base] = iter(slugs)
+
+    return [next(free[base]) for base in bases]
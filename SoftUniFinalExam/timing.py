@@ -0,0 +1,122 @@
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from users.roles import has_any_role
+
+STAFF_ROLES = ('staff', 'admin')
+
+_current_timer = ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    def __init__(self, detailed=True):
+        self.detailed = detailed
+        self.started = time.perf_counter()
+        self.durations = defaultdict(float)
+        self.queries = 0
+        self.total = None
+
+    def stop(self):
+        self.total = time.perf_counter() - self.started
+
+    def metrics(self):
+        yield 'db', self.durations['db'], f'{self.queries} queries'
+        for name in ('perm', 'render'):
+            if name in self.durations:
+                yield name, self.durations[name], None
+        yield 'total', self.total, None
+
+    def header(self):
+        entries = []
+        for name, duration, description in self.metrics():
+            entry = f'{name};dur={duration * 1000:.1f}'
+            if description:
+                entry += f';desc="{description}"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+
+def should_sample():
+    rate = settings.SERVER_TIMING_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+@contextmanager
+def timed_request(detailed=True):
+    timer = _current_timer.get()
+    if timer is not None:
+        yield timer
+        return
+
+    timer = RequestTimer(detailed)
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+        timer.stop()
+
+
+@contextmanager
+def segment(name):
+    timer = _current_timer.get()
+    if timer is None or not timer.detailed:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.durations[name] += time.perf_counter() - started
+
+
+def record_query(execute, sql, params, many, context):
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    if not timer.detailed:
+        timer.queries += 1
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.durations['db'] += time.perf_counter() - started
+        timer.queries += 1
+
+
+def install_query_timer(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def is_timing_viewer(user):
+    if user is None or not user.is_authenticated:
+        return False
+    return user.is_superuser or user.is_staff or has_any_role(user, STAFF_ROLES)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with segment('render'):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,60 @@
+from django.db import connections, router
+
+from SoftUniFinalExam.generations import bump_generation
+from clubs.models import Club
+
+JOINED = 'joined'
+ALREADY_MEMBER = 'already_member'
+IN_OTHER_CLUB = 'in_other_club'
+
+Membership = Club.members.through
+
+
+def _execute(sql, params):
+    connection = connections[router.db_for_write(Membership)]
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(table=connection.ops.quote_name(Membership._meta.db_table)), params)
+        return cursor.fetchall()
+
+
+def join_club(user_id, club_id, switch=False):
+    if switch:
+        rows = _execute(
+            "INSERT INTO {table} (club_id, user_id) VALUES (%s, %s) "
+            "ON CONFLICT (user_id) DO UPDATE SET club_id = excluded.club_id "
+            "WHERE {table}.club_id <> excluded.club_id "
+            "RETURNING club_id",
+            [club_id, user_id]
+        )
+    else:
+        rows = _execute(
+            "INSERT INTO {table} (club_id, user_id) VALUES (%s, %s) "
+            "ON CONFLICT (user_id) DO NOTHING "
+            "RETURNING club_id",
+            [club_id, user_id]
+        )
+
+    if rows:
+        bump_generation(Club._meta.label_lower)
+        return JOINED
+
+    current = club_of(user_id)
+    return ALREADY_MEMBER if current == club_id else IN_OTHER_CLUB
+
+
+def leave_club(user_id, club_id=None):
+    if club_id is None:
+        rows = _execute("DELETE FROM {table} WHERE user_id = %s RETURNING club_id", [user_id])
+    else:
+        rows = _execute(
+            "DELETE FROM {table} WHERE user_id = %s AND club_id = %s RETURNING club_id",
+            [user_id, club_id]
+        )
+
+    if rows:
+        bump_generation(Club._meta.label_lower)
+    return rows[0][0] if rows else None
+
+
+def club_of(user_id):
+    return Membership.objects.filter(user_id=user_id).values_list('club_id', flat=True).first()
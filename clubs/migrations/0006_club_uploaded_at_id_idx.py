@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0005_alter_club_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(fields=['uploaded_at', 'id'], name='club_uploaded_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0007_club_related'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                'DELETE FROM clubs_club_members WHERE id NOT IN '
+                '(SELECT MIN(id) FROM clubs_club_members GROUP BY user_id)',
+                'CREATE UNIQUE INDEX clubs_club_members_user_id_uniq ON clubs_club_members (user_id)',
+            ],
+            reverse_sql='DROP INDEX clubs_club_members_user_id_uniq',
+        ),
+    ]
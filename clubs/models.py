@@ -1,9 +1,14 @@
 from django.db import models
-from django.utils.text import slugify
 from users.models import Users
 from django.contrib.auth.models import User
+from SoftUniFinalExam.mixins import UniqueSlugMixin
+
+class Club(UniqueSlugMixin, models.Model):
+    class Meta:
+        indexes = [
+            models.Index(fields=['uploaded_at', 'id'], name='club_uploaded_at_id_idx'),
+        ]
 
-class Club(models.Model):
     title = models.CharField(
         max_length=100,
         unique=True,
@@ -38,13 +43,16 @@ class Club(models.Model):
         editable=False,
     )
 
+    related = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+    )
+
+    similarity_fields = ('title', 'content')
+
     def short_content(self):
         return self.content[:50] + '...' if len(self.content) > 50 else self.content
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.title
\ No newline at end of file
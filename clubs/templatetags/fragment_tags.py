@@ -0,0 +1,36 @@
+from django import template
+from django.templatetags.cache import CacheNode
+
+from SoftUniFinalExam.generations import get_generation
+from SoftUniFinalExam.routers import primary_reads
+
+register = template.Library()
+
+
+class PrimaryCacheNode(CacheNode):
+    def render(self, context):
+        # A miss refills a key shared by every visitor, so it must not read from a lagging replica.
+        with primary_reads():
+            return super().render(context)
+
+
+@register.simple_tag
+def generation(*labels):
+    return '-'.join(str(get_generation(label)) for label in labels)
+
+
+@register.tag
+def primary_cache(parser, token):
+    nodelist = parser.parse(('endprimary_cache',))
+    parser.delete_first_token()
+    tokens = token.split_contents()
+    if len(tokens) < 3:
+        raise template.TemplateSyntaxError(f"'{tokens[0]}' tag requires at least 2 arguments.")
+
+    return PrimaryCacheNode(
+        nodelist,
+        parser.compile_filter(tokens[1]),
+        tokens[2],
+        [parser.compile_filter(bit) for bit in tokens[3:]],
+        None,
+    )
@@ -0,0 +1,33 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from SoftUniFinalExam.images import MIME_TYPES, get_variants
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(path, alt, sizes='100vw', loading='lazy', **attrs):
+    entry = get_variants(path)
+    attributes = {'alt': alt, 'loading': loading, 'decoding': 'async', **attrs}
+    if entry is None:
+        return format_html('<img src="{}"{}>', static(path), _attributes(attributes))
+
+    attributes.update(width=entry['width'], height=entry['height'])
+    if entry['placeholder']:
+        style = f"background: url({entry['placeholder']}) center / cover no-repeat"
+        attributes['style'] = f"{attributes['style']}; {style}" if 'style' in attributes else style
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[image_format], ', '.join(f'{static(name)} {width}w' for width, name in variants), sizes)
+            for image_format, variants in sorted(entry['variants'].items())
+        ),
+    )
+    return format_html('<picture>{}<img src="{}"{}></picture>', sources, static(path), _attributes(attributes))
+
+
+def _attributes(attributes):
+    return format_html_join('', ' {}="{}"', ((name.replace('_', '-'), value) for name, value in attributes.items()))
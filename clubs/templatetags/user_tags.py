@@ -1,7 +1,9 @@
 from django import template
 
+from users.roles import get_user_roles
+
 register = template.Library()
 
 @register.filter
 def in_group(user, group_name):
-    return user.groups.filter(name=group_name).exists()
+    return group_name in get_user_roles(user)
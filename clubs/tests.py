@@ -1,3 +1,44 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from clubs import membership
+from clubs.models import Club
+
+
+class ClubMembershipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.clubs = [
+            Club.objects.create(
+                title=f"Climbing club {i}",
+                image='https://example.com/club.jpg',
+                content="Weekly bouldering meetups",
+                owner="Owner",
+                user=cls.user.users,
+            )
+            for i in range(2)
+        ]
+
+    def test_user_belongs_to_one_club(self):
+        first, second = self.clubs
+
+        self.assertEqual(membership.join_club(self.user.id, first.id), membership.JOINED)
+        self.assertEqual(membership.join_club(self.user.id, first.id), membership.ALREADY_MEMBER)
+        self.assertEqual(membership.join_club(self.user.id, second.id), membership.IN_OTHER_CLUB)
+        self.assertEqual(membership.club_of(self.user.id), first.id)
+
+        second.members.add(self.user)
+        self.assertEqual(list(self.user.joined_clubs.all()), [first])
+
+    def test_switch_and_leave(self):
+        first, second = self.clubs
+        membership.join_club(self.user.id, first.id)
+
+        self.assertEqual(membership.join_club(self.user.id, second.id, switch=True), membership.JOINED)
+        self.assertEqual(list(first.members.all()), [])
+        self.assertEqual(list(second.members.all()), [self.user])
+
+        self.assertIsNone(membership.leave_club(self.user.id, first.id))
+        self.assertEqual(membership.leave_club(self.user.id), second.id)
+        self.assertIsNone(membership.club_of(self.user.id))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0003_competitions_participants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='competitions',
+            index=models.Index(fields=['date', 'id'], name='competition_date_id_idx'),
+        ),
+    ]
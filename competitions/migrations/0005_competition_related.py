@@ -0,0 +1,25 @@
+# Generated by Django 4.2.16 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+from SoftUniFinalExam.similarity import rebuild_related
+
+
+def build_related(apps, schema_editor):
+    rebuild_related(apps.get_model('competitions', 'Competitions'), fields=('title', 'context'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0004_competition_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competitions',
+            name='related',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(build_related, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0005_competition_related'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competitions',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='competitions',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,11 +1,16 @@
 from django.contrib.auth.models import User
 from django.db import models
-from django.utils.text import slugify
 
 from clubs.models import Club
+from SoftUniFinalExam.mixins import UniqueSlugMixin
 
 
-class Competitions(models.Model):
+class Competitions(UniqueSlugMixin, models.Model):
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'id'], name='competition_date_id_idx'),
+        ]
+
     title = models.CharField(
         max_length=100,
     )
@@ -35,10 +40,37 @@ class Competitions(models.Model):
         blank=True,
     )
 
+    capacity = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+    )
+
+    registered_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    related = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+    )
+
+    similarity_fields = ('title', 'context')
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'registered_count'
+            ]
         super().save(*args, **kwargs)
 
+    @property
+    def places_left(self):
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.registered_count, 0)
+
     def __str__(self):
         return f"{self.title} - Hosted by {self.club.title} on {self.date}"
@@ -1,3 +1,90 @@
-from django.test import TestCase
+import datetime
+import threading
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+
+from SoftUniFinalExam.slugs import reserve_slugs
+from clubs.models import Club
+from competitions.models import Competitions
+
+
+class CompetitionMixin:
+    def create_club(self):
+        owner = User.objects.create_user(username='owner', password='password')
+        return Club.objects.create(
+            title="Climbing club",
+            image='https://example.com/club.jpg',
+            content="Weekly bouldering meetups",
+            owner="Owner",
+            user=owner.users,
+        )
+
+    def create_competition(self, title, club):
+        return Competitions.objects.create(
+            title=title,
+            date=datetime.date(2025, 1, 1),
+            context="Open category",
+            club=club,
+        )
+
+
+class SlugAllocationTests(CompetitionMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.club = cls().create_club()
+
+    def test_collisions_get_the_next_free_suffix(self):
+        slugs = [self.create_competition("Bouldering Cup", self.club).slug for _ in range(3)]
+        self.assertEqual(slugs, ['bouldering-cup', 'bouldering-cup-2', 'bouldering-cup-3'])
+
+    def test_numbers_in_titles_are_not_suffixes(self):
+        self.assertEqual(self.create_competition("Bouldering Cup 2025", self.club).slug, 'bouldering-cup-2025')
+        self.assertEqual(self.create_competition("Bouldering Cup", self.club).slug, 'bouldering-cup')
+        self.assertEqual(self.create_competition("Bouldering Cup", self.club).slug, 'bouldering-cup-2')
+        self.assertEqual(self.create_competition("Bouldering Cup 2025", self.club).slug, 'bouldering-cup-2025-2')
+
+    def test_crowded_base_is_probed_without_loading_every_slug(self):
+        Competitions.objects.bulk_create([
+            Competitions(
+                title="Bouldering Cup",
+                slug='bouldering-cup' if number == 1 else f'bouldering-cup-{number}',
+                date=datetime.date(2025, 1, 1),
+                context="Open category",
+                club=self.club,
+            )
+            for number in range(1, 30)
+        ])
+
+        with self.assertNumQueries(3):
+            slugs = reserve_slugs(Competitions, ["Bouldering Cup", "Trad Cup", "Bouldering Cup"])
+        self.assertEqual(slugs, ['bouldering-cup-30', 'trad-cup', 'bouldering-cup-31'])
+
+
+@skipUnless(connection.vendor == 'postgresql', "Concurrent slug allocation relies on Postgres advisory locks.")
+class ConcurrentSlugAllocationTests(CompetitionMixin, TransactionTestCase):
+    def test_parallel_saves_get_distinct_slugs(self):
+        club = self.create_club()
+        barrier = threading.Barrier(8)
+        errors = []
+
+        def save():
+            try:
+                barrier.wait()
+                self.create_competition("Bouldering Cup", club)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=save) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        slugs = set(Competitions.objects.values_list('slug', flat=True))
+        self.assertEqual(slugs, {'bouldering-cup', *(f'bouldering-cup-{number}' for number in range(2, 9))})
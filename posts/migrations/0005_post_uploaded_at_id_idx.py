@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_alter_post_slug'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['uploaded_at', 'id'], name='post_uploaded_at_id_idx'),
+        ),
+    ]
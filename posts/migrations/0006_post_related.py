@@ -0,0 +1,25 @@
+# Generated by Django 4.2.16 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+from SoftUniFinalExam.similarity import rebuild_related
+
+
+def build_related(apps, schema_editor):
+    rebuild_related(apps.get_model('posts', 'Post'), fields=('title', 'content'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_uploaded_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='related',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(build_related, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,14 @@
-from django.utils.text import slugify
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator
 from django.db import models, IntegrityError
+from SoftUniFinalExam.mixins import UniqueSlugMixin
 
-class Post(models.Model):
+class Post(UniqueSlugMixin, models.Model):
     class Meta:
         verbose_name = "Post"
+        indexes = [
+            models.Index(fields=['uploaded_at', 'id'], name='post_uploaded_at_id_idx'),
+        ]
 
     title = models.CharField(
         max_length=50,
@@ -38,13 +41,16 @@ class Post(models.Model):
         editable=False,
     )
 
+    related = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+    )
+
+    similarity_fields = ('title', 'content')
+
     def short_content(self):
         return self.content[:50] + '...' if len(self.content) > 50 else self.content
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.title
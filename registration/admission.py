@@ -0,0 +1,100 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from competitions.models import Competitions
+from registration.models import Registration
+
+UNIQUE_REGISTRATION = 'registration_user_competition_uniq'
+
+
+class AlreadyRegistered(Exception):
+    pass
+
+
+def _is_duplicate(error):
+    # Postgres names the violated constraint; SQLite only lists its columns.
+    constraint = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+    if constraint is not None:
+        return constraint == UNIQUE_REGISTRATION
+
+    table = Registration._meta.db_table
+    return UNIQUE_REGISTRATION in str(error) or f'{table}.user_id, {table}.competition_id' in str(error)
+
+
+def _admit(competition_id):
+    has_room = Q(capacity__isnull=True) | Q(registered_count__lt=F('capacity'))
+    return Competitions.objects.filter(has_room, pk=competition_id).update(
+        registered_count=F('registered_count') + 1
+    )
+
+
+def _lock(competition_id):
+    return Competitions.objects.select_for_update().only('capacity', 'registered_count').get(pk=competition_id)
+
+
+def register(registration):
+    existing = Registration.objects.filter(user_id=registration.user_id, competition_id=registration.competition_id)
+    try:
+        with transaction.atomic():
+            if existing.exists():
+                raise AlreadyRegistered()
+
+            admitted = _admit(registration.competition_id)
+            if not admitted:
+                _lock(registration.competition_id)
+                admitted = _admit(registration.competition_id)
+
+            registration.status = Registration.Status.ADMITTED if admitted else Registration.Status.WAITLISTED
+            registration.save()
+
+            # A registration replaces the same competition saved to the profile, if the user had saved it.
+            saved = Competitions.participants.through.objects.filter(
+                competitions_id=registration.competition_id,
+                user_id=registration.user_id,
+            )
+            if saved.exists():
+                registration.competition.participants.remove(registration.user_id)
+    except IntegrityError as error:
+        if not _is_duplicate(error):
+            raise
+        # A concurrent request registered the same user first; the rollback also returned the place.
+        raise AlreadyRegistered()
+
+    return registration
+
+
+def withdraw(registration):
+    competition_id = registration.competition_id
+
+    with transaction.atomic():
+        _lock(competition_id)
+        status = Registration.objects.filter(pk=registration.pk).values_list('status', flat=True).first()
+        if status is None:
+            return []
+
+        Registration.objects.filter(pk=registration.pk).delete()
+        if status == Registration.Status.ADMITTED:
+            Competitions.objects.filter(pk=competition_id).update(registered_count=F('registered_count') - 1)
+
+        return promote_waitlist(competition_id)
+
+
+def promote_waitlist(competition_id):
+    with transaction.atomic():
+        places_left = _lock(competition_id).places_left
+        if places_left == 0:
+            return []
+
+        waiting = Registration.objects.filter(
+            competition_id=competition_id,
+            status=Registration.Status.WAITLISTED,
+        ).order_by('created_at', 'id').values_list('id', flat=True)
+        promoted = list(waiting if places_left is None else waiting[:places_left])
+
+        if promoted:
+            Registration.objects.filter(pk__in=promoted).update(status=Registration.Status.ADMITTED)
+            Competitions.objects.filter(pk=competition_id).update(
+                registered_count=F('registered_count') + len(promoted)
+            )
+
+    return promoted
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:40
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.utils.timezone
+
+
+def count_registrations(apps, schema_editor):
+    Competitions = apps.get_model('competitions', 'Competitions')
+    Registration = apps.get_model('registration', 'Registration')
+
+    counts = Registration.objects.values('competition').annotate(total=Count('id'))
+    for row in counts:
+        Competitions.objects.filter(pk=row['competition']).update(registered_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0006_competitions_capacity'),
+        ('registration', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registration',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='registration',
+            name='status',
+            field=models.CharField(choices=[('admitted', 'Admitted'), ('waitlisted', 'Waitlisted')], default='admitted', editable=False, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['competition', 'status', 'created_at', 'id'], name='registration_waitlist_idx'),
+        ),
+        migrations.RunPython(count_registrations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.16 on 2026-10-18 08:18
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Q
+
+
+def drop_duplicates(apps, schema_editor):
+    Competitions = apps.get_model('competitions', 'Competitions')
+    Registration = apps.get_model('registration', 'Registration')
+
+    duplicates = (
+        Registration.objects.values('user', 'competition')
+        .annotate(first=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    affected = set()
+    for row in duplicates:
+        Registration.objects.filter(user=row['user'], competition=row['competition']).exclude(pk=row['first']).delete()
+        affected.add(row['competition'])
+
+    counts = (
+        Competitions.objects.filter(pk__in=affected)
+        .annotate(admitted=Count('registrations', filter=Q(registrations__status='admitted')))
+        .values_list('pk', 'admitted')
+    )
+    for pk, admitted in counts:
+        Competitions.objects.filter(pk=pk).update(registered_count=admitted)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0002_registration_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='registration',
+            constraint=models.UniqueConstraint(fields=('user', 'competition'), name='registration_user_competition_uniq'),
+        ),
+    ]
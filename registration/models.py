@@ -6,9 +6,30 @@ from users.models import Users
 
 
 class Registration(models.Model):
+    class Status(models.TextChoices):
+        ADMITTED = 'admitted', 'Admitted'
+        WAITLISTED = 'waitlisted', 'Waitlisted'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['competition', 'status', 'created_at', 'id'], name='registration_waitlist_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'competition'], name='registration_user_competition_uniq'),
+        ]
+
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     age = models.PositiveIntegerField()
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="registrations")
     competition = models.ForeignKey(Competitions, on_delete=models.CASCADE, related_name="registrations")
-
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.ADMITTED,
+        editable=False,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False,
+    )
@@ -1,3 +1,172 @@
-from django.test import TestCase
+import datetime
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connections
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+
+from SoftUniFinalExam.generations import get_generation
+from clubs.models import Club
+from competitions.models import Competitions
+from registration import admission
+from registration.models import Registration
+
+
+class AdmissionMixin:
+    def create_competition(self, capacity):
+        owner = User.objects.create_user(username='owner', password='password')
+        club = Club.objects.create(
+            title="Climbing club",
+            image='https://example.com/club.jpg',
+            content="Weekly bouldering meetups",
+            owner="Owner",
+            user=owner.users,
+        )
+        return Competitions.objects.create(
+            title="Bouldering Cup",
+            date=datetime.date(2025, 1, 1),
+            context="Open category",
+            club=club,
+            capacity=capacity,
+        )
+
+    def register(self, user, competition):
+        return admission.register(Registration(
+            first_name=user.username,
+            last_name="Climber",
+            age=20,
+            user=user,
+            competition=competition,
+        ))
+
+    def assert_statuses(self, competition, admitted, waitlisted):
+        competition.refresh_from_db()
+        registrations = competition.registrations.all()
+
+        self.assertEqual(competition.registered_count, admitted)
+        self.assertEqual(registrations.filter(status=Registration.Status.ADMITTED).count(), admitted)
+        self.assertEqual(registrations.filter(status=Registration.Status.WAITLISTED).count(), waitlisted)
+
+
+class CompetitionAdmissionTests(AdmissionMixin, TestCase):
+    def test_overflow_is_waitlisted_and_promoted_in_order(self):
+        competition = self.create_competition(capacity=2)
+        users = [User.objects.create_user(username=f'climber{i}', password='password') for i in range(5)]
+        registrations = [self.register(user, competition) for user in users]
+
+        self.assertEqual(
+            [registration.status for registration in registrations],
+            ['admitted', 'admitted', 'waitlisted', 'waitlisted', 'waitlisted'],
+        )
+        self.assert_statuses(competition, admitted=2, waitlisted=3)
+
+        self.assertEqual(admission.withdraw(registrations[0]), [registrations[2].pk])
+        self.assertEqual(admission.withdraw(registrations[4]), [])
+        self.assert_statuses(competition, admitted=2, waitlisted=1)
+
+        competition.capacity = 5
+        competition.save()
+        self.assertEqual(admission.promote_waitlist(competition.pk), [registrations[3].pk])
+        self.assert_statuses(competition, admitted=3, waitlisted=0)
+
+    def test_second_registration_is_rejected(self):
+        competition = self.create_competition(capacity=2)
+        climber = User.objects.create_user(username='climber', password='password')
+        self.register(climber, competition)
+
+        with self.assertRaises(admission.AlreadyRegistered):
+            self.register(climber, competition)
+        self.assert_statuses(competition, admitted=1, waitlisted=0)
+
+        with mock.patch.object(QuerySet, 'exists', return_value=False), self.assertRaises(admission.AlreadyRegistered):
+            self.register(climber, competition)
+        self.assert_statuses(competition, admitted=1, waitlisted=0)
+
+    def test_saving_competition_keeps_counter(self):
+        competition = self.create_competition(capacity=3)
+        stale = Competitions.objects.get(pk=competition.pk)
+        self.register(User.objects.create_user(username='climber', password='password'), competition)
+
+        stale.title = "Bouldering Cup Finals"
+        stale.save()
+        self.assert_statuses(competition, admitted=1, waitlisted=0)
+
+    def test_admission_uses_the_stored_counter(self):
+        competition = self.create_competition(capacity=2)
+        # Another request took the last places after this instance was loaded.
+        Competitions.objects.filter(pk=competition.pk).update(registered_count=2)
+
+        registration = self.register(User.objects.create_user(username='climber', password='password'), competition)
+        self.assertEqual(registration.status, Registration.Status.WAITLISTED)
+        competition.refresh_from_db()
+        self.assertEqual(competition.registered_count, 2)
+
+    def test_other_integrity_errors_are_raised(self):
+        competition = self.create_competition(capacity=2)
+        climber = User.objects.create_user(username='climber', password='password')
+
+        error = IntegrityError("NOT NULL constraint failed: registration_registration.age")
+        with mock.patch.object(Registration, 'save', side_effect=error), self.assertRaises(IntegrityError):
+            self.register(climber, competition)
+        self.assert_statuses(competition, admitted=0, waitlisted=0)
+
+    def test_registration_replaces_saved_competition_only_when_saved(self):
+        competition = self.create_competition(capacity=2)
+        saver, climber = (User.objects.create_user(username=name, password='password') for name in ('saver', 'climber'))
+        competition.participants.add(saver)
+
+        generation = get_generation('competitions.competitions')
+        self.register(climber, competition)
+        self.assertEqual(get_generation('competitions.competitions'), generation)
+
+        self.register(saver, competition)
+        self.assertFalse(competition.participants.exists())
+        self.assertNotEqual(get_generation('competitions.competitions'), generation)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class CompetitionAdmissionStressTests(AdmissionMixin, TransactionTestCase):
+    climbers = 40
+    capacity = 10
+
+    def run_parallel(self, target, items):
+        barrier = threading.Barrier(len(items))
+        errors = []
+
+        def run(item):
+            try:
+                barrier.wait()
+                target(item)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=run, args=(item,)) for item in items]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+    def test_parallel_submits_never_oversell(self):
+        competition = self.create_competition(capacity=self.capacity)
+        users = [User.objects.create_user(username=f'climber{i}', password='password') for i in range(self.climbers)]
+
+        self.run_parallel(lambda user: self.register(user, competition), users)
+        self.assert_statuses(competition, admitted=self.capacity, waitlisted=self.climbers - self.capacity)
+
+        admitted = list(competition.registrations.filter(status=Registration.Status.ADMITTED)[:5])
+        waitlist = list(competition.registrations.filter(
+            status=Registration.Status.WAITLISTED,
+        ).order_by('created_at', 'id').values_list('pk', flat=True))
+
+        self.run_parallel(admission.withdraw, admitted)
+        self.assert_statuses(competition, admitted=self.capacity, waitlisted=self.climbers - self.capacity - 5)
+        self.assertEqual(
+            set(competition.registrations.filter(pk__in=waitlist[:5]).values_list('status', flat=True)),
+            {Registration.Status.ADMITTED},
+        )
@@ -0,0 +1,216 @@
+import re
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Q
+from django.urls import reverse
+
+TABLE = 'search_entry'
+SUMMARY_LENGTH = 200
+REBUILD_BATCH_SIZE = 500
+TOKEN_RE = re.compile(r'\w+')
+
+KINDS = {
+    'post': {'model': 'posts.Post', 'body': 'content', 'url_name': 'post_detail', 'code': 1},
+    'club': {'model': 'clubs.Club', 'body': 'content', 'url_name': 'club_detail', 'code': 2},
+    'competition': {'model': 'competitions.Competitions', 'body': 'context', 'url_name': 'competition_detail', 'code': 3},
+}
+
+
+def kind_for_model(model):
+    label = model._meta.label
+    for kind, config in KINDS.items():
+        if config['model'] == label:
+            return kind
+    return None
+
+
+def _summary(body):
+    return body[:SUMMARY_LENGTH] + '...' if len(body) > SUMMARY_LENGTH else body
+
+
+def _fts_rowid(kind, object_id):
+    return object_id * 4 + KINDS[kind]['code']
+
+
+UPSERT_SQL = {
+    'postgresql': f"""
+        INSERT INTO {TABLE} (kind, object_id, title, slug, summary, document)
+        VALUES (%s, %s, %s, %s, %s,
+                setweight(to_tsvector('english', %s), 'A') || setweight(to_tsvector('english', %s), 'B'))
+        ON CONFLICT (kind, object_id) DO UPDATE
+        SET title = EXCLUDED.title, slug = EXCLUDED.slug,
+            summary = EXCLUDED.summary, document = EXCLUDED.document
+    """,
+    'sqlite': f"""
+        INSERT OR REPLACE INTO {TABLE} (rowid, kind, object_id, slug, summary, title, body)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """,
+}
+
+
+def _upsert_params(vendor, kind, object_id, title, slug, body):
+    if vendor == 'postgresql':
+        return [kind, object_id, title, slug, _summary(body), title, body]
+    return [_fts_rowid(kind, object_id), kind, object_id, slug, _summary(body), title, body]
+
+
+def index_documents(documents, using=None):
+    using = using or connection
+    if using.vendor not in UPSERT_SQL:
+        return
+
+    params = [_upsert_params(using.vendor, *document) for document in documents]
+    if params:
+        with using.cursor() as cursor:
+            cursor.executemany(UPSERT_SQL[using.vendor], params)
+
+
+def index_document(kind, object_id, title, slug, body, using=None):
+    index_documents([(kind, object_id, title, slug, body)], using=using)
+
+
+def index_objects(instances):
+    documents = []
+    for instance in instances:
+        kind = kind_for_model(type(instance))
+        documents.append((kind, instance.pk, instance.title, instance.slug, getattr(instance, KINDS[kind]['body'])))
+    index_documents(documents)
+
+
+def index_object(instance):
+    index_objects([instance])
+
+
+def remove_object(instance):
+    kind = kind_for_model(type(instance))
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"DELETE FROM {TABLE} WHERE kind = %s AND object_id = %s", [kind, instance.pk])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [_fts_rowid(kind, instance.pk)])
+
+
+def rebuild_index(using=None):
+    using = using or connection
+    with using.cursor() as cursor:
+        if using.vendor in ('postgresql', 'sqlite'):
+            cursor.execute(f"DELETE FROM {TABLE}")
+
+    total = 0
+    for kind, config in KINDS.items():
+        model = apps.get_model(config['model'])
+        rows = model.objects.values_list('pk', 'title', 'slug', config['body']).iterator()
+
+        batch = []
+        for object_id, title, slug, body in rows:
+            batch.append((kind, object_id, title, slug, body))
+            if len(batch) == REBUILD_BATCH_SIZE:
+                index_documents(batch, using=using)
+                total += len(batch)
+                batch = []
+
+        index_documents(batch, using=using)
+        total += len(batch)
+
+    return total
+
+
+def _result(kind, object_id, title, slug, summary):
+    return {
+        'kind': kind,
+        'id': object_id,
+        'title': title,
+        'summary': summary,
+        'url': reverse(KINDS[kind]['url_name'], args=[slug]) if slug else None,
+    }
+
+
+class SearchResults:
+    def __init__(self, query):
+        self.query = query
+        self.terms = TOKEN_RE.findall(query)
+        self._count = None
+
+    def _fts_query(self):
+        return ' '.join(f'"{term}"*' for term in self.terms)
+
+    def _tsquery(self):
+        return ' & '.join(f'{term}:*' for term in self.terms)
+
+    def count(self):
+        if self._count is None:
+            self._count = self._fetch_count() if self.terms else 0
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        if not self.terms:
+            return []
+
+        offset = item.start or 0
+        limit = (item.stop if item.stop is not None else self.count()) - offset
+        return self._fetch(offset, max(limit, 0))
+
+    def _fetch_count(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"SELECT count(*) FROM {TABLE} WHERE document @@ to_tsquery('english', %s)",
+                    [self._tsquery()]
+                )
+            elif connection.vendor == 'sqlite':
+                cursor.execute(f"SELECT count(*) FROM {TABLE} WHERE {TABLE} MATCH %s", [self._fts_query()])
+            else:
+                return sum(self._fallback_queryset(kind).count() for kind in KINDS)
+            return cursor.fetchone()[0]
+
+    def _fetch(self, offset, limit):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    f"""
+                    SELECT kind, object_id, title, slug, summary
+                    FROM {TABLE}, to_tsquery('english', %s) query
+                    WHERE document @@ query
+                    ORDER BY ts_rank_cd(document, query) DESC, id
+                    LIMIT %s OFFSET %s
+                    """,
+                    [self._tsquery(), limit, offset]
+                )
+            elif connection.vendor == 'sqlite':
+                cursor.execute(
+                    f"""
+                    SELECT kind, object_id, title, slug, summary
+                    FROM {TABLE}
+                    WHERE {TABLE} MATCH %s
+                    ORDER BY bm25({TABLE}, 0, 0, 0, 0, 10.0, 1.0), rowid
+                    LIMIT %s OFFSET %s
+                    """,
+                    [self._fts_query(), limit, offset]
+                )
+            else:
+                return self._fallback_fetch(offset, limit)
+            return [_result(*row) for row in cursor.fetchall()]
+
+    def _fallback_queryset(self, kind):
+        config = KINDS[kind]
+        condition = Q()
+        for term in self.terms:
+            condition &= Q(title__icontains=term) | Q(**{f"{config['body']}__icontains": term})
+        return apps.get_model(config['model']).objects.filter(condition)
+
+    def _fallback_fetch(self, offset, limit):
+        results = []
+        for kind, config in KINDS.items():
+            rows = self._fallback_queryset(kind).values_list('pk', 'title', 'slug', config['body'])
+            results.extend(_result(kind, pk, title, slug, _summary(body)) for pk, title, slug, body in rows)
+        return results[offset:offset + limit]
+
+
+def search(query):
+    return SearchResults(query)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from search.backends import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for posts, clubs and competitions."
+
+    def handle(self, *args, **options):
+        total = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents."))
@@ -0,0 +1,100 @@
+from django.db import migrations
+
+# The schema and the first fill are copied here rather than imported from search.backends,
+# so later changes to the backend cannot change what this migration does.
+TABLE = 'search_entry'
+SUMMARY_LENGTH = 200
+BATCH_SIZE = 500
+
+KINDS = (
+    ('post', 'posts', 'Post', 'content', 1),
+    ('club', 'clubs', 'Club', 'content', 2),
+    ('competition', 'competitions', 'Competitions', 'context', 3),
+)
+
+CREATE_SQL = {
+    'postgresql': [
+        f"""
+        CREATE TABLE {TABLE} (
+            id bigserial PRIMARY KEY,
+            kind varchar(20) NOT NULL,
+            object_id bigint NOT NULL,
+            title text NOT NULL,
+            slug varchar(100),
+            summary text NOT NULL,
+            document tsvector NOT NULL,
+            UNIQUE (kind, object_id)
+        )
+        """,
+        f"CREATE INDEX {TABLE}_document_gin ON {TABLE} USING gin (document)",
+    ],
+    'sqlite': [
+        f"""
+        CREATE VIRTUAL TABLE {TABLE} USING fts5(
+            kind UNINDEXED, object_id UNINDEXED, slug UNINDEXED, summary UNINDEXED, title, body,
+            tokenize = 'porter unicode61'
+        )
+        """,
+    ],
+}
+
+INSERT_SQL = {
+    'postgresql': f"""
+        INSERT INTO {TABLE} (kind, object_id, title, slug, summary, document)
+        VALUES (%s, %s, %s, %s, %s,
+                setweight(to_tsvector('english', %s), 'A') || setweight(to_tsvector('english', %s), 'B'))
+    """,
+    'sqlite': f"""
+        INSERT INTO {TABLE} (rowid, kind, object_id, slug, summary, title, body)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """,
+}
+
+
+def summary(body):
+    return body[:SUMMARY_LENGTH] + '...' if len(body) > SUMMARY_LENGTH else body
+
+
+def row_params(vendor, kind, code, object_id, title, slug, body):
+    if vendor == 'postgresql':
+        return [kind, object_id, title, slug, summary(body), title, body]
+    return [object_id * 4 + code, kind, object_id, slug, summary(body), title, body]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in CREATE_SQL:
+        return
+
+    for statement in CREATE_SQL[vendor]:
+        schema_editor.execute(statement)
+
+    with schema_editor.connection.cursor() as cursor:
+        for kind, app_label, model_name, body, code in KINDS:
+            rows = apps.get_model(app_label, model_name).objects.values_list('pk', 'title', 'slug', body)
+            batch = []
+            for row in rows.iterator():
+                batch.append(row_params(vendor, kind, code, *row))
+                if len(batch) == BATCH_SIZE:
+                    cursor.executemany(INSERT_SQL[vendor], batch)
+                    batch = []
+            if batch:
+                cursor.executemany(INSERT_SQL[vendor], batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_related'),
+        ('clubs', '0007_club_related'),
+        ('competitions', '0005_competition_related'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+from SoftUniFinalExam.similarity import index_terms
+
+SOURCES = (
+    ('posts', 'Post', ('title', 'content')),
+    ('clubs', 'Club', ('title', 'content')),
+    ('competitions', 'Competitions', ('title', 'context')),
+)
+
+
+def build_terms(apps, schema_editor):
+    term_model = apps.get_model('search', 'SimilarityTerm')
+    for app_label, model_name, fields in SOURCES:
+        index_terms(apps.get_model(app_label, model_name), fields=fields, term_model=term_model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('term', models.CharField(max_length=100)),
+                ('weight', models.FloatField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term'], name='similarity_kind_term_idx'), models.Index(fields=['kind', 'object_id'], name='similarity_kind_object_idx')],
+            },
+        ),
+        migrations.RunPython(build_terms, migrations.RunPython.noop),
+    ]
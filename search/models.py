@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class SimilarityTerm(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'term'], name='similarity_kind_term_idx'),
+            models.Index(fields=['kind', 'object_id'], name='similarity_kind_object_idx'),
+        ]
+
+    kind = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    term = models.CharField(max_length=100)
+    weight = models.FloatField()
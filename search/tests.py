@@ -0,0 +1,124 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from SoftUniFinalExam import similarity
+from clubs.models import Club
+from posts.models import Post
+from search.backends import search
+from search.models import SimilarityTerm
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+
+    def create_post(self, title, content="Session notes"):
+        return Post.objects.create(
+            title=title,
+            image_url='https://example.com/post.jpg',
+            content=content,
+            user=self.user.users,
+        )
+
+    def titles(self, query):
+        return [result['title'] for result in search(query)[:20]]
+
+    def test_saves_updates_and_deletes_are_indexed(self):
+        post = self.create_post("Bouldering in Vratsa")
+        result = search("vratsa")[0]
+        self.assertEqual((result['kind'], result['id']), ('post', post.pk))
+        self.assertEqual(result['url'], reverse('post_detail', args=[post.slug]))
+
+        post.title = "Sport climbing in Lakatnik"
+        post.save()
+        self.assertEqual(self.titles("vratsa"), [])
+        self.assertEqual(self.titles("lakatnik"), ["Sport climbing in Lakatnik"])
+
+        post.delete()
+        self.assertEqual(self.titles("lakatnik"), [])
+
+    def test_title_matches_rank_above_body_matches(self):
+        self.create_post("Weekend trip", content="Granite slabs and a long approach")
+        self.create_post("Granite slabs", content="Weekend trip notes")
+        Club.objects.create(
+            title="Crag club",
+            image='https://example.com/club.jpg',
+            content="Granite weekends",
+            owner="Owner",
+            user=self.user.users,
+        )
+
+        titles = self.titles("granite")
+        self.assertEqual(titles[0], "Granite slabs")
+        self.assertEqual(sorted(titles[1:]), ["Crag club", "Weekend trip"])
+
+    def test_terms_match_prefixes_and_must_all_match(self):
+        self.create_post("Bouldering basics")
+        self.create_post("Bouldering competition recap")
+
+        self.assertEqual(self.titles("boulder"), ["Bouldering basics", "Bouldering competition recap"])
+        self.assertEqual(self.titles("boulder compet"), ["Bouldering competition recap"])
+        self.assertEqual(self.titles("!!!"), [])
+
+    def test_results_are_paged(self):
+        for i in range(12):
+            self.create_post(f"Crimp training {i}")
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('search'), {'q': 'crimp', 'page': 2})
+        self.assertEqual(response.context['page_obj'].paginator.count, 12)
+        self.assertEqual(len(response.context['results']), 2)
+
+    def test_rebuild_restores_the_index(self):
+        self.create_post("Dry tooling")
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM search_entry")
+        self.assertEqual(self.titles("tooling"), [])
+
+        call_command('rebuild_search_index', stdout=mock.Mock())
+        self.assertEqual(self.titles("tooling"), ["Dry tooling"])
+
+    def test_other_databases_fall_back_to_icontains(self):
+        self.create_post("Multi-pitch rescue", content="Rope systems")
+        self.create_post("Rope care")
+
+        with mock.patch('search.backends.connection', mock.MagicMock(vendor='mysql')):
+            results = search("rope")
+            self.assertEqual(results.count(), 2)
+            self.assertEqual({result['title'] for result in results[:10]}, {"Multi-pitch rescue", "Rope care"})
+
+
+class SimilarityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = User.objects.create_user(username='climber', password='password').users
+
+    def create_post(self, title, content):
+        return Post.objects.create(title=title, image_url='https://example.com/post.jpg', content=content, user=self.profile)
+
+    def test_save_scores_only_the_changed_row(self):
+        boulder = self.create_post("Bouldering wall", "New bouldering wall with overhang problems")
+        overhang = self.create_post("Overhang session", "Steep overhang bouldering problems tonight")
+        self.create_post("Alpine trip", "Glacier crossing and ridge traverse")
+
+        boulder.refresh_from_db()
+        self.assertEqual([pk for pk, score in boulder.related], [overhang.pk])
+
+        with mock.patch('SoftUniFinalExam.similarity.tokenize', wraps=similarity.tokenize) as tokenize:
+            overhang.title, overhang.content = "Ridge traverse", "Alpine ridge traverse above the glacier"
+            overhang.save()
+
+        self.assertEqual(tokenize.call_count, 1)
+        boulder.refresh_from_db()
+        self.assertEqual(boulder.related, [])
+        self.assertEqual(len(overhang.related), 1)
+
+        overhang.delete()
+        self.assertFalse(SimilarityTerm.objects.filter(kind='posts.post', object_id=overhang.pk).exists())
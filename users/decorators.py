@@ -1,7 +1,19 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import mixins
+from django.contrib.auth.views import redirect_to_login
 from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.utils.decorators import method_decorator
 
+from SoftUniFinalExam.timing import segment
+from users.roles import has_any_role
+
+
+def _is_authenticated(user):
+    with segment('perm'):
+        return user.is_authenticated
+
+
 def unauthenticated_user(view_func):
     def wrapper_func(request, *args, **kwargs):
         if request.user.is_authenticated:
@@ -15,27 +27,63 @@ def unauthenticated_user(view_func):
 def allowed_users(allowed_roles=[]):
     def decorator(view_func):
         def wrapper_func(request, *args, **kwargs):
+            with segment('perm'):
+                allowed = has_any_role(request.user, allowed_roles)
 
-            if request.user.groups.exists():
-                group_names = [group.name for group in request.user.groups.all()]
-                if any(group in allowed_roles for group in group_names):
-                    return view_func(request, *args, **kwargs)
+            if allowed:
+                return view_func(request, *args, **kwargs)
 
             return HttpResponse("You are not allowed to access this page.")
         return wrapper_func
     return decorator
 
 
+def async_login_required(login_url=None):
+    def decorator(view_func):
+        async def wrapper_func(request, *args, **kwargs):
+            if await sync_to_async(_is_authenticated)(request.user):
+                return await view_func(request, *args, **kwargs)
+
+            return redirect_to_login(request.get_full_path(), login_url)
+        return wrapper_func
+    return decorator
+
+
+class LoginRequiredMixin(mixins.LoginRequiredMixin):
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._async_login_dispatch(request, *args, **kwargs)
+
+        if not _is_authenticated(request.user):
+            return self.handle_no_permission()
+
+        return super(mixins.LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+    async def _async_login_dispatch(self, request, *args, **kwargs):
+        if not await sync_to_async(_is_authenticated)(request.user):
+            return self.handle_no_permission()
+
+        return await super(mixins.LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+
 class AllowedUsersMixin:
     allowed_roles = []
 
+    def has_allowed_role(self, user):
+        with segment('perm'):
+            return user.is_superuser or user.is_staff or has_any_role(user, self.allowed_roles)
+
     def dispatch(self, request, *args, **kwargs):
-        if request.user.is_superuser or request.user.is_staff:
+        if self.view_is_async:
+            return self._async_roles_dispatch(request, *args, **kwargs)
+
+        if self.has_allowed_role(request.user):
             return super().dispatch(request, *args, **kwargs)
 
-        if request.user.groups.exists():
-            group_names = [group.name for group in request.user.groups.all()]
-            if any(group in self.allowed_roles for group in group_names):
-                return super().dispatch(request, *args, **kwargs)
+        return HttpResponse("You are not allowed to access this page.")
+
+    async def _async_roles_dispatch(self, request, *args, **kwargs):
+        if await sync_to_async(self.has_allowed_role)(request.user):
+            return await super().dispatch(request, *args, **kwargs)
 
         return HttpResponse("You are not allowed to access this page.")
\ No newline at end of file
@@ -0,0 +1,327 @@
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from clubs.models import Club
+from competitions.models import Competitions
+from posts.models import Post
+from users.views import PanelSectionView
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?(?![\w\"])")
+IN_LIST = re.compile(r"IN \((?:\?(?:, )?)+\)")
+WHITESPACE = re.compile(r"\s+")
+
+WHERE_CLAUSE = re.compile(r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)", re.S)
+ORDER_CLAUSE = re.compile(r"\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|$)", re.S)
+JOIN_CLAUSE = re.compile(r'JOIN "(\w+)"(?: \w+)? ON \((.*?)\)')
+COMPARISON = re.compile(r'"(\w+)"\."(\w+)"\s*(=|<=|>=|<|>|IN\b|IS\b|LIKE\b)')
+COLUMN = re.compile(r'"(\w+)"\."(\w+)"')
+
+EQUALITY = ('=', 'IN', 'IS')
+MAX_INDEX_COLUMNS = 3
+
+
+def normalize(sql):
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = IN_LIST.sub('IN (...)', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+def table_columns(sql):
+    equality = OrderedDict()
+    ranges = OrderedDict()
+    ordering = OrderedDict()
+
+    where = WHERE_CLAUSE.search(sql)
+    if where:
+        for table, column, operator in COMPARISON.findall(where.group(1)):
+            target = equality if operator.strip() in EQUALITY else ranges
+            target.setdefault(table, []).append(column)
+
+    for table, condition in JOIN_CLAUSE.findall(sql):
+        for joined_table, column in COLUMN.findall(condition):
+            if joined_table == table:
+                equality.setdefault(table, []).append(column)
+
+    order = ORDER_CLAUSE.search(sql)
+    if order:
+        for table, column in COLUMN.findall(order.group(1)):
+            ordering.setdefault(table, []).append(column)
+
+    return equality, ranges, ordering
+
+
+def unique(values):
+    return list(OrderedDict.fromkeys(values))
+
+
+def index_name(table, columns):
+    name = f"{table}_{'_'.join(columns)}"
+    if len(name) > 26:
+        digest = hashlib.md5(name.encode()).hexdigest()[:8]
+        name = f"{name[:17]}_{digest}"
+    return f"{name}_idx"
+
+
+class Command(BaseCommand):
+    help = (
+        "Exercise a representative set of URLs, group the queries they issue by shape, "
+        "report sequential-scan candidates and write a migration with the recommended indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths', help="URL path to exercise; repeat to add more.")
+        parser.add_argument('--username', help="Exercise the URLs as this user instead of a temporary superuser.")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--dry-run', action='store_true', help="Report only, don't write migrations.")
+        parser.add_argument('--top', type=int, default=15, help="Number of query shapes to report.")
+
+    def handle(self, *args, **options):
+        self.connection = connections[options['database']]
+        self.tables = self.table_models()
+
+        with transaction.atomic(using=options['database']):
+            queries = self.capture(options['paths'] or self.default_paths(), options['username'])
+            shapes = self.group(queries)
+            for shape in shapes.values():
+                shape['scans'] = self.sequential_scans(shape['sql'])
+            transaction.set_rollback(True, using=options['database'])
+
+        self.report(shapes, options['top'])
+        recommendations = self.recommend(shapes)
+
+        if not recommendations:
+            self.stdout.write(self.style.SUCCESS("No missing indexes found."))
+            return
+
+        self.stdout.write("Recommended indexes:")
+        for table, columns in recommendations:
+            self.stdout.write(f"  {table} ({', '.join(columns)})")
+
+        if not options['dry_run']:
+            for path in self.write_migrations(recommendations):
+                self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
+
+    def table_models(self):
+        return {
+            model._meta.db_table: model
+            for model in apps.get_models(include_auto_created=True)
+        }
+
+    def default_paths(self):
+        paths = [reverse(name) for name in ('user-home', 'profile', 'posts', 'clubs', 'competitions', 'admin_club_panel')]
+        paths.append(f"{reverse('search')}?q=climbing")
+        paths += [reverse('admin-panel-section', args=[section]) for section in PanelSectionView.sections]
+
+        for model, url_name in ((Post, 'post_detail'), (Club, 'club_detail'), (Competitions, 'competition_detail')):
+            slug = model.objects.exclude(slug=None).values_list('slug', flat=True).first()
+            if slug:
+                paths.append(reverse(url_name, args=[slug]))
+
+        club_id = Club.objects.values_list('id', flat=True).first()
+        if club_id:
+            paths.append(reverse('admin_club_members', args=[club_id]))
+
+        return paths
+
+    def capture(self, paths, username):
+        if username:
+            try:
+                user = User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User {username!r} does not exist.")
+        else:
+            user = User.objects.create_superuser(username='index-advisor', password=None)
+
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            client = Client()
+            client.force_login(user)
+
+            with CaptureQueriesContext(self.connection) as queries:
+                for path in paths:
+                    response = client.get(path)
+                    self.stdout.write(f"GET {path} -> {response.status_code}")
+
+        return queries.captured_queries
+
+    def group(self, queries):
+        shapes = {}
+        for query in queries:
+            if not query['sql'].lstrip().upper().startswith('SELECT'):
+                continue
+
+            shape = shapes.setdefault(normalize(query['sql']), {'sql': query['sql'], 'count': 0, 'time': 0.0})
+            shape['count'] += 1
+            shape['time'] += float(query['time'])
+
+        return shapes
+
+    def sequential_scans(self, sql):
+        vendor = self.connection.vendor
+        try:
+            # A failed statement aborts the surrounding transaction on Postgres; the savepoint keeps it usable.
+            with transaction.atomic(using=self.connection.alias, savepoint=True), self.connection.cursor() as cursor:
+                if vendor == 'postgresql':
+                    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    return set(self.postgres_scans(plan[0]['Plan']))
+                if vendor == 'sqlite':
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    details = [row[-1].replace('SCAN TABLE ', 'SCAN ') for row in cursor.fetchall()]
+                    return {
+                        detail.split()[1]
+                        for detail in details
+                        if detail.startswith('SCAN ')
+                    }
+        except DatabaseError as error:
+            self.stderr.write(f"EXPLAIN failed for {normalize(sql)[:120]}: {error}")
+
+        return None
+
+    def postgres_scans(self, node):
+        if node.get('Node Type') == 'Seq Scan':
+            yield node['Relation Name']
+        for child in node.get('Plans', []):
+            yield from self.postgres_scans(child)
+
+    def report(self, shapes, top):
+        ranked = sorted(shapes.items(), key=lambda item: item[1]['time'], reverse=True)[:top]
+
+        self.stdout.write(f"\n{len(shapes)} query shapes. Slowest {len(ranked)}:")
+        for shape, stats in ranked:
+            scans = stats['scans']
+            scanned = 'unknown' if scans is None else (', '.join(sorted(scans)) or '-')
+            self.stdout.write(
+                f"  {stats['count']:>4}x {stats['time'] * 1000:>8.2f} ms  seq scan: {scanned}\n"
+                f"        {shape[:200]}"
+            )
+        self.stdout.write('')
+
+    def existing_indexes(self, table):
+        with self.connection.cursor() as cursor:
+            constraints = self.connection.introspection.get_constraints(cursor, table)
+
+        return [
+            (constraint['columns'], constraint['unique'] or constraint['primary_key'])
+            for constraint in constraints.values()
+            if constraint['columns'] and (constraint['index'] or constraint['unique'] or constraint['primary_key'])
+        ]
+
+    def is_covered(self, columns, indexes):
+        for index_columns, is_unique in indexes:
+            if list(index_columns[:len(columns)]) == list(columns):
+                return True
+            if is_unique and list(columns[:len(index_columns)]) == list(index_columns):
+                return True
+        return False
+
+    def recommend(self, shapes):
+        candidates = OrderedDict()
+
+        for stats in shapes.values():
+            equality, ranges, ordering = table_columns(stats['sql'])
+            for table in unique([*equality, *ranges, *ordering]):
+                if table not in self.tables:
+                    continue
+                if stats['scans'] is not None and table not in stats['scans']:
+                    continue
+
+                columns = unique(equality.get(table, []))
+                trailing = ranges.get(table, [])[:1] or ordering.get(table, [])
+                columns += [column for column in unique(trailing) if column not in columns]
+                if columns:
+                    candidates.setdefault(table, set()).add(tuple(columns[:MAX_INDEX_COLUMNS]))
+
+        recommendations = []
+        for table, column_sets in candidates.items():
+            indexes = self.existing_indexes(table)
+            for columns in sorted(column_sets, key=len, reverse=True):
+                if not self.is_covered(columns, indexes):
+                    recommendations.append((table, columns))
+                    indexes.append((columns, False))
+
+        return recommendations
+
+    def write_migrations(self, recommendations):
+        loader = MigrationLoader(self.connection)
+        by_app = OrderedDict()
+        for table, columns in recommendations:
+            app_label = self.tables[table]._meta.app_label
+            by_app.setdefault(app_label, []).append((table, columns))
+
+        paths = []
+        for app_label, indexes in by_app.items():
+            if not self.is_project_app(app_label):
+                self.stderr.write(f"Skipping {app_label}: it is not one of this project's apps.")
+                continue
+
+            leaves = loader.graph.leaf_nodes(app_label)
+            if not leaves:
+                self.stderr.write(f"Skipping {app_label}: it has no migrations.")
+                continue
+
+            leaf = leaves[0][1]
+            number = int(leaf.split('_')[0]) + 1
+            name = f"{number:04d}_advised_indexes"
+            module_name, explicit = MigrationLoader.migrations_module(app_label)
+            directory = os.path.dirname(import_module(module_name).__file__)
+            path = os.path.join(directory, f"{name}.py")
+
+            with open(path, 'w') as migration:
+                migration.write(self.render_migration(app_label, leaf, indexes))
+            paths.append(path)
+
+        return paths
+
+    def is_project_app(self, app_label):
+        path = os.path.realpath(apps.get_app_config(app_label).path)
+        root = os.path.realpath(settings.BASE_DIR)
+        return path.startswith(root + os.sep) and 'site-packages' not in path.split(os.sep)
+
+    def render_migration(self, app_label, dependency, indexes):
+        quote = self.connection.ops.quote_name
+        operations = []
+        for table, columns in indexes:
+            name = index_name(table, columns)
+            column_list = ', '.join(quote(column) for column in columns)
+            operations.append(
+                "        migrations.RunSQL(\n"
+                f"            sql='CREATE INDEX IF NOT EXISTS {quote(name)} ON {quote(table)} ({column_list})',\n"
+                f"            reverse_sql='DROP INDEX IF EXISTS {quote(name)}',\n"
+                "        ),\n"
+            )
+
+        return (
+            f"# Generated by advise_indexes on {datetime.now():%Y-%m-%d %H:%M}\n"
+            "\n"
+            "from django.db import migrations\n"
+            "\n"
+            "\n"
+            "class Migration(migrations.Migration):\n"
+            "\n"
+            "    dependencies = [\n"
+            f"        ('{app_label}', '{dependency}'),\n"
+            "    ]\n"
+            "\n"
+            "    operations = [\n"
+            f"{''.join(operations)}"
+            "    ]\n"
+        )
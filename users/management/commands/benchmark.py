@@ -0,0 +1,226 @@
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from clubs.models import Club
+from competitions.models import Competitions
+from posts.models import Post
+from registration.models import Registration
+from users import urls as user_urls
+from users.views import PanelSectionView
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks', 'baseline.json')
+
+SLUG_MODELS = (
+    ('post', Post),
+    ('club', Club),
+    ('competition', Competitions),
+)
+
+# These change state on GET. The savepoint rolls back their rows, but not the role invalidation or
+# generation bumps they trigger in the cache.
+SKIPPED_ROUTES = ('logout', 'join_club', 'leave_club', 'add_competition', 'delete_user', 'make_superuser')
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every route in users/urls.py through the test client and record wall time, "
+        "query count and peak memory; compare against a stored baseline to flag regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="Timed requests per route after one warm-up request.")
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+        parser.add_argument('--save', action='store_true', help="Store this run as the new baseline.")
+        parser.add_argument('--route', action='append', dest='routes', help="Only benchmark this URL name.")
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.5,
+            help="Relative slowdown (time or memory) that counts as a regression.",
+        )
+        parser.add_argument(
+            '--min-delta-ms',
+            type=float,
+            default=5.0,
+            help="Ignore time regressions smaller than this many milliseconds.",
+        )
+        parser.add_argument('--fail-on-regression', action='store_true')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.connection = connections[options['database']]
+        self.routes = options['routes']
+
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            results = self.run(options['repeat'], options['database'])
+
+        self.report(results)
+
+        if options['save']:
+            self.save(options['baseline'], results)
+            return
+
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --save to create one.")
+            return
+
+        with open(options['baseline']) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = self.compare(baseline['routes'], results, options['threshold'], options['min_delta_ms'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+            return
+
+        self.stdout.write(self.style.ERROR(f"{len(regressions)} regression(s):"))
+        for regression in regressions:
+            self.stdout.write(f"  {regression}")
+
+        if options['fail_on_regression']:
+            raise CommandError("Benchmark regressions found.")
+
+    def run(self, repeat, database):
+        results = {}
+
+        with transaction.atomic(using=database):
+            user = User.objects.create_superuser(username='benchmark-runner', password=None)
+            for name in ('user', 'staff', 'admin'):
+                user.groups.add(Group.objects.get_or_create(name=name)[0])
+
+            client = Client()
+            for label, path in self.paths(user):
+                client.force_login(user)
+                self.measure(client, path, database)
+
+                samples = []
+                for _ in range(repeat):
+                    client.force_login(user)
+                    samples.append(self.measure(client, path, database))
+
+                # tracemalloc slows down every allocation, so memory comes from separate passes that are not timed.
+                peaks = []
+                for _ in range(repeat):
+                    client.force_login(user)
+                    peaks.append(self.measure(client, path, database, trace_memory=True)['peak_kb'])
+
+                results[label] = {
+                    'path': path,
+                    'status': samples[-1]['status'],
+                    'time_ms': round(min(sample['time_ms'] for sample in samples), 3),
+                    'queries': max(sample['queries'] for sample in samples),
+                    'peak_kb': round(statistics.median(peaks), 1),
+                }
+
+            transaction.set_rollback(True, using=database)
+
+        return results
+
+    def measure(self, client, path, database, trace_memory=False):
+        sid = transaction.savepoint(using=database)
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            with CaptureQueriesContext(self.connection) as queries:
+                started = time.perf_counter()
+                response = client.get(path)
+                elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+            transaction.savepoint_rollback(sid, using=database)
+
+        return {
+            'status': response.status_code,
+            'time_ms': elapsed * 1000,
+            'queries': len(queries),
+            'peak_kb': peak / 1024,
+        }
+
+    def paths(self, user):
+        for pattern in user_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or pattern.name in SKIPPED_ROUTES:
+                continue
+            if self.routes and pattern.name not in self.routes:
+                continue
+
+            converters = pattern.pattern.converters
+            if 'section' in converters:
+                for section in PanelSectionView.sections:
+                    yield f'{pattern.name}:{section}', reverse(pattern.name, args=[section])
+                continue
+
+            args = [self.argument(pattern.name, name, user) for name in converters]
+            if None in args:
+                self.stderr.write(f"Skipping {pattern.name}: no data for its URL arguments.")
+                continue
+
+            yield pattern.name, reverse(pattern.name, args=args)
+
+    def argument(self, route, name, user):
+        if name == 'slug':
+            for prefix, model in SLUG_MODELS:
+                if prefix in route:
+                    return model.objects.exclude(slug=None).order_by('pk').values_list('slug', flat=True).first()
+        if name == 'club_id':
+            return Club.objects.order_by('pk').values_list('pk', flat=True).first()
+        if name == 'competitions_id':
+            return Competitions.objects.order_by('pk').values_list('pk', flat=True).first()
+        if name == 'user_id':
+            return User.objects.exclude(pk=user.pk).order_by('pk').values_list('pk', flat=True).first()
+        if name == 'pk':
+            return Registration.objects.order_by('pk').values_list('pk', flat=True).first()
+        return None
+
+    def report(self, results):
+        self.stdout.write(f"{'route':<40} {'status':>6} {'ms':>9} {'queries':>7} {'peak KB':>9}")
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label:<40} {result['status']:>6} {result['time_ms']:>9.2f} "
+                f"{result['queries']:>7} {result['peak_kb']:>9.1f}"
+            )
+
+    def save(self, path, results):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        counts = {
+            'posts': Post.objects.count(),
+            'clubs': Club.objects.count(),
+            'competitions': Competitions.objects.count(),
+            'users': User.objects.count(),
+        }
+        with open(path, 'w') as baseline_file:
+            json.dump({'dataset': counts, 'routes': results}, baseline_file, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Saved baseline to {path}"))
+
+    def compare(self, baseline, results, threshold, min_delta_ms):
+        regressions = []
+        for label, result in results.items():
+            previous = baseline.get(label)
+            if previous is None:
+                continue
+
+            if result['queries'] > previous['queries']:
+                regressions.append(f"{label}: {previous['queries']} -> {result['queries']} queries")
+
+            delta = result['time_ms'] - previous['time_ms']
+            if delta > min_delta_ms and result['time_ms'] > previous['time_ms'] * (1 + threshold):
+                regressions.append(f"{label}: {previous['time_ms']:.2f} -> {result['time_ms']:.2f} ms")
+
+            if result['peak_kb'] > previous['peak_kb'] * (1 + threshold) + 64:
+                regressions.append(f"{label}: {previous['peak_kb']:.1f} -> {result['peak_kb']:.1f} KB peak memory")
+
+            if result['status'] != previous['status']:
+                regressions.append(f"{label}: status {previous['status']} -> {result['status']}")
+
+        return regressions
@@ -0,0 +1,56 @@
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+class Command(BaseCommand):
+    help = "Count database round trips per authenticated request with the database and cache-backed session engines."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'url_names',
+            nargs='*',
+            default=['user-home', 'profile', 'posts', 'clubs', 'competitions'],
+        )
+        parser.add_argument('--rounds', type=int, default=10)
+
+    def handle(self, *args, **options):
+        url_names = options['url_names']
+
+        with transaction.atomic():
+            group, created = Group.objects.get_or_create(name='user')
+            user = User.objects.create_user(username='session-benchmark', password='session-benchmark')
+            user.groups.add(group)
+
+            results = [self.measure(engine, user, url_names, options['rounds']) for engine in ENGINES]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'session engine':<45} {'queries/request':>16} {'session queries/request':>24}")
+        for engine, total, session in results:
+            self.stdout.write(f"{engine:<45} {total:>16.2f} {session:>24.2f}")
+
+    def measure(self, engine, user, url_names, rounds):
+        with override_settings(SESSION_ENGINE=engine, ALLOWED_HOSTS=['testserver']):
+            client = Client()
+            client.force_login(user)
+            urls = [reverse(name) for name in url_names]
+
+            for url in urls:
+                client.get(url)
+
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(rounds):
+                    for url in urls:
+                        client.get(url)
+
+        requests = rounds * len(urls)
+        session_queries = sum('django_session' in query['sql'] for query in queries.captured_queries)
+        return engine, len(queries) / requests, session_queries / requests
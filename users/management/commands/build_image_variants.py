@@ -0,0 +1,138 @@
+import base64
+import glob
+import io
+import json
+import os
+
+from PIL import Image, ImageFilter, ImageOps, features
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from SoftUniFinalExam.images import MANIFEST_NAME, VARIANTS_DIR, variant_name
+
+SOURCE_PATTERNS = ('images/*.jpg', 'images/*.jpeg', 'images/*.png')
+QUALITY = {'avif': 50, 'webp': 75}
+PLACEHOLDER_WIDTH = 16
+
+
+def has_transparency(image):
+    return 'A' in image.getbands() and image.getchannel('A').getextrema()[0] < 255
+
+
+def placeholder(image):
+    tiny = image.convert('RGB')
+    tiny.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH))
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    tiny.save(buffer, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate resized AVIF/WebP variants and blur placeholders for the bundled static images "
+        "and write the manifest read by the responsive_image template tag."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="Static paths such as images/post2.jpg (default: every image).")
+        parser.add_argument('--widths', default='160,320,640,960,1280',
+                            help="Comma separated widths. Images are never upscaled.")
+        parser.add_argument('--formats', default='avif,webp', help="Comma separated output formats.")
+        parser.add_argument('--quality', type=int, help="Encoder quality for every format.")
+        parser.add_argument('--force', action='store_true', help="Re-encode variants that are already up to date.")
+
+    def handle(self, *args, **options):
+        self.root = str(settings.STATICFILES_DIRS[0])
+        self.force = options['force']
+        self.widths = sorted({int(width) for width in options['widths'].split(',') if width.strip()})
+        if not self.widths:
+            raise CommandError("At least one width is required.")
+
+        self.formats = []
+        for image_format in (value.strip().lower() for value in options['formats'].split(',')):
+            if image_format not in QUALITY:
+                raise CommandError(f"Unsupported format {image_format!r}.")
+            if not features.check(image_format):
+                self.stderr.write(f"Pillow was built without {image_format} support, skipping it.")
+                continue
+            self.formats.append(image_format)
+        if not self.formats:
+            raise CommandError("None of the requested formats can be encoded.")
+
+        self.quality = {image_format: options['quality'] or QUALITY[image_format] for image_format in self.formats}
+
+        paths = options['paths'] or sorted(
+            os.path.relpath(path, self.root).replace(os.sep, '/')
+            for pattern in SOURCE_PATTERNS
+            for path in glob.glob(os.path.join(self.root, pattern))
+        )
+
+        os.makedirs(os.path.join(self.root, VARIANTS_DIR), exist_ok=True)
+        manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+
+        original_bytes = variant_bytes = written = 0
+        for path in paths:
+            source = os.path.join(self.root, path)
+            if not os.path.isfile(source):
+                raise CommandError(f"{path} is not a file in {self.root}.")
+
+            entry, count = self.build(path, source)
+            manifest[path] = entry
+            written += count
+
+            size = os.path.getsize(source)
+            full_width = min(
+                os.path.getsize(os.path.join(self.root, variants[-1][1])) for variants in entry['variants'].values()
+            )
+            original_bytes += size
+            variant_bytes += full_width
+            self.stdout.write(f"{path}: {size / 1024:.0f} KB original, {full_width / 1024:.0f} KB largest variant")
+
+        temporary = f'{manifest_path}.tmp'
+        with open(temporary, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+        os.replace(temporary, manifest_path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} variants for {len(paths)} images; full width "
+            f"{original_bytes / 1024:.0f} KB -> {variant_bytes / 1024:.0f} KB."
+        ))
+
+    def build(self, path, source):
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original)
+            image = image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+
+        width, height = image.size
+        widths = sorted({min(candidate, width) for candidate in self.widths})
+        source_mtime = os.path.getmtime(source)
+
+        entry = {
+            'width': width,
+            'height': height,
+            'placeholder': None if has_transparency(image) else placeholder(image),
+            'variants': {},
+        }
+        written = 0
+        for image_format in self.formats:
+            entry['variants'][image_format] = []
+            for target in widths:
+                name = variant_name(path, target, image_format)
+                destination = os.path.join(self.root, name)
+                entry['variants'][image_format].append([target, name])
+
+                if not self.force and os.path.exists(destination) and os.path.getmtime(destination) >= source_mtime:
+                    continue
+
+                resized = image if target == width else image.resize(
+                    (target, max(1, round(height * target / width))), Image.Resampling.LANCZOS, reducing_gap=3.0,
+                )
+                resized.save(destination, image_format.upper(), quality=self.quality[image_format])
+                written += 1
+
+        return entry, written
@@ -0,0 +1,253 @@
+import datetime
+import random
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from SoftUniFinalExam.generations import bump_generation
+from clubs.models import Club
+from competitions.models import Competitions
+from posts.models import Post
+from registration.models import Registration
+from users.models import Users
+
+CAPACITIES = (None, 20, 50, 100)
+
+WORDS = (
+    "boulder", "crimp", "sloper", "jug", "pinch", "dyno", "heel", "hook", "beta", "crux", "project",
+    "send", "flash", "onsight", "lead", "top", "rope", "belay", "chalk", "campus", "board", "overhang",
+    "slab", "arete", "dihedral", "mantle", "gaston", "undercling", "traverse", "highball",
+)
+
+RATIOS = {
+    'clubs': 0.02,
+    'competitions': 0.05,
+    'posts': 1.0,
+    'members': 0.8,
+    'participants': 2.0,
+    'registrations': 0.5,
+}
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+class Command(BaseCommand):
+    help = "Populate the database with a synthetic climbing community for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1000, help="Number of users; other tables scale from it.")
+        parser.add_argument('--prefix', default='bench', help="Prefix for generated usernames and titles.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--password', default='benchmark-password')
+        parser.add_argument(
+            '--with-indexes',
+            action='store_true',
+            help="Rebuild the search and related-items indexes afterwards (slow at large scales).",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.batch_size = options['batch_size']
+        scale = options['scale']
+
+        if User.objects.filter(username__startswith=f'{self.prefix}-').exists():
+            raise CommandError(f"Data with prefix {self.prefix!r} already exists; pick another --prefix.")
+
+        counts = {name: max(1, int(scale * ratio)) for name, ratio in RATIOS.items()}
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            groups = {name: Group.objects.get_or_create(name=name)[0] for name in ('user', 'staff', 'admin')}
+            user_ids, profile_ids = self.create_users(scale, make_password(options['password']), groups)
+            club_ids = self.create_clubs(counts['clubs'], profile_ids)
+            competition_ids = self.create_competitions(counts['competitions'], club_ids)
+            self.create_posts(counts['posts'], profile_ids)
+            self.create_members(min(counts['members'], len(user_ids)), user_ids, club_ids)
+            self.create_participants(counts['participants'], user_ids, competition_ids)
+            self.create_registrations(counts['registrations'], user_ids, competition_ids)
+
+        for label in ('users.users', 'posts.post', 'clubs.club', 'competitions.competitions'):
+            bump_generation(label)
+
+        if options['with_indexes']:
+            call_command('rebuild_related', stdout=self.stdout)
+            call_command('rebuild_search_index', stdout=self.stdout)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {scale} users, {counts['clubs']} clubs, {counts['competitions']} competitions, "
+            f"{counts['posts']} posts in {elapsed:.1f}s."
+        ))
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield range(start, min(start + self.batch_size, total))
+
+    def create_users(self, total, password, groups):
+        user_ids = []
+        profile_ids = []
+        membership = User.groups.through
+
+        for batch in self.batches(total):
+            users = User.objects.bulk_create([
+                User(
+                    username=f'{self.prefix}-{number}',
+                    email=f'{self.prefix}-{number}@example.com',
+                    first_name=self.rng.choice(WORDS).title(),
+                    last_name=self.rng.choice(WORDS).title(),
+                    password=password,
+                )
+                for number in batch
+            ])
+            profiles = Users.objects.bulk_create([
+                Users(
+                    user=user,
+                    username=user.username,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    email=user.email,
+                    phone='0888000000',
+                    info=sentence(self.rng, 12),
+                )
+                for user in users
+            ])
+            membership.objects.bulk_create([
+                membership(user_id=user.id, group_id=self.pick_group(number, groups).id)
+                for number, user in zip(batch, users)
+            ])
+
+            user_ids += [user.id for user in users]
+            profile_ids += [profile.id for profile in profiles]
+
+        self.stdout.write(f"users: {len(user_ids)}")
+        return user_ids, profile_ids
+
+    def pick_group(self, number, groups):
+        if number % 500 == 0:
+            return groups['admin']
+        if number % 50 == 0:
+            return groups['staff']
+        return groups['user']
+
+    def create_clubs(self, total, profile_ids):
+        club_ids = []
+        for batch in self.batches(total):
+            clubs = Club.objects.bulk_create([
+                Club(
+                    title=f'{self.prefix} club {number}',
+                    slug=f'{self.prefix}-club-{number}',
+                    image=f'https://example.com/{self.prefix}/clubs/{number}.jpg',
+                    content=sentence(self.rng, 40),
+                    owner=sentence(self.rng, 2).title(),
+                    user_id=self.rng.choice(profile_ids),
+                )
+                for number in batch
+            ])
+            club_ids += [club.id for club in clubs]
+
+        self.stdout.write(f"clubs: {len(club_ids)}")
+        return club_ids
+
+    def create_competitions(self, total, club_ids):
+        competition_ids = []
+        first_day = datetime.date.today()
+
+        for batch in self.batches(total):
+            competitions = Competitions.objects.bulk_create([
+                Competitions(
+                    title=f'{self.prefix} cup {number}',
+                    slug=f'{self.prefix}-cup-{number}',
+                    date=first_day + datetime.timedelta(days=self.rng.randint(-180, 365)),
+                    context=sentence(self.rng, 30),
+                    club_id=self.rng.choice(club_ids),
+                    capacity=self.rng.choice(CAPACITIES),
+                )
+                for number in batch
+            ])
+            competition_ids += [competition.id for competition in competitions]
+
+        self.stdout.write(f"competitions: {len(competition_ids)}")
+        return competition_ids
+
+    def create_posts(self, total, profile_ids):
+        for batch in self.batches(total):
+            Post.objects.bulk_create([
+                Post(
+                    title=f'{self.prefix} post {number}',
+                    slug=f'{self.prefix}-post-{number}',
+                    image_url=f'https://example.com/{self.prefix}/posts/{number}.jpg',
+                    content=sentence(self.rng, 60),
+                    user_id=self.rng.choice(profile_ids),
+                )
+                for number in batch
+            ])
+
+        self.stdout.write(f"posts: {total}")
+
+    def create_members(self, total, user_ids, club_ids):
+        membership = Club.members.through
+        members = self.rng.sample(user_ids, total)
+
+        for batch in self.batches(total):
+            membership.objects.bulk_create([
+                membership(user_id=members[index], club_id=self.rng.choice(club_ids))
+                for index in batch
+            ], ignore_conflicts=True)
+
+        self.stdout.write(f"members: {total}")
+
+    def create_participants(self, total, user_ids, competition_ids):
+        participation = Competitions.participants.through
+
+        for batch in self.batches(total):
+            participation.objects.bulk_create([
+                participation(user_id=self.rng.choice(user_ids), competitions_id=self.rng.choice(competition_ids))
+                for _ in batch
+            ], ignore_conflicts=True)
+
+        self.stdout.write(f"participants: {total}")
+
+    def create_registrations(self, total, user_ids, competition_ids):
+        for batch in self.batches(total):
+            Registration.objects.bulk_create([
+                Registration(
+                    first_name=self.rng.choice(WORDS).title(),
+                    last_name=self.rng.choice(WORDS).title(),
+                    age=self.rng.randint(12, 60),
+                    user_id=self.rng.choice(user_ids),
+                    competition_id=self.rng.choice(competition_ids),
+                )
+                for _ in batch
+            ], ignore_conflicts=True)
+
+        capacities = dict(Competitions.objects.filter(pk__in=competition_ids).values_list('pk', 'capacity'))
+        admitted = Counter()
+        waitlisted = []
+        registrations = Registration.objects.filter(competition_id__in=competition_ids).order_by('pk')
+        for pk, competition_id in registrations.values_list('pk', 'competition_id').iterator():
+            capacity = capacities[competition_id]
+            if capacity is None or admitted[competition_id] < capacity:
+                admitted[competition_id] += 1
+            else:
+                waitlisted.append(pk)
+
+        for start in range(0, len(waitlisted), self.batch_size):
+            Registration.objects.filter(pk__in=waitlisted[start:start + self.batch_size]).update(
+                status=Registration.Status.WAITLISTED
+            )
+        Competitions.objects.bulk_update(
+            [Competitions(pk=pk, registered_count=admitted[pk]) for pk in capacities],
+            ['registered_count'],
+            batch_size=self.batch_size,
+        )
+
+        self.stdout.write(f"registrations: {total}")
@@ -0,0 +1,232 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from SoftUniFinalExam.generations import bump_generation
+from SoftUniFinalExam.similarity import rebuild_related
+from SoftUniFinalExam.slugs import reserve_slugs
+from clubs.forms import ClubCreateForm
+from clubs.models import Club
+from competitions.forms import CompetitionCreateForm
+from competitions.models import Competitions
+from posts.forms import PostCreateForm
+from posts.models import Post
+from search.backends import index_objects
+from search.models import SimilarityTerm
+from users.models import Users
+
+KINDS = {
+    'clubs': {'model': Club, 'form': ClubCreateForm, 'm2m': 'members', 'owned': True},
+    'competitions': {'model': Competitions, 'form': CompetitionCreateForm, 'm2m': 'participants', 'owned': False},
+    'posts': {'model': Post, 'form': PostCreateForm, 'm2m': None, 'owned': True},
+}
+
+
+def import_form(form_class):
+    class ImportForm(form_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.fields.pop('club', None)
+
+        def validate_unique(self):
+            pass
+
+    return ImportForm
+
+
+def read_rows(stream, file_format):
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield number, ValueError(f"invalid JSON: {error}")
+            continue
+        yield number, row if isinstance(row, dict) else ValueError("expected a JSON object")
+
+
+def split_names(value):
+    if isinstance(value, list):
+        return [name.strip() for name in value if name.strip()]
+    return [name.strip() for name in (value or '').split(';') if name.strip()]
+
+
+class Command(BaseCommand):
+    help = "Bulk import clubs, competitions or posts from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(KINDS))
+        parser.add_argument('path', help="Input file, or - for stdin.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension.")
+        parser.add_argument('--owner', help="Username that owns imported clubs and posts.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--skip-related', action='store_true',
+            help="Leave the related-items index for a later rebuild_related run.",
+        )
+
+    def handle(self, *args, **options):
+        config = KINDS[options['kind']]
+        self.model = config['model']
+        self.form_class = import_form(config['form'])
+        self.m2m = config['m2m']
+        self.batch_size = max(1, options['batch_size'])
+
+        self.owner = None
+        if config['owned']:
+            if not options['owner']:
+                raise CommandError(f"--owner is required when importing {options['kind']}.")
+            try:
+                self.owner = Users.objects.get(user__username=options['owner'])
+            except Users.DoesNotExist:
+                raise CommandError(f"No profile found for user {options['owner']}.")
+
+        file_format = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.json')) else 'csv')
+        stream = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+
+        imported = rejected = 0
+        started = time.monotonic()
+        try:
+            rows = read_rows(stream, file_format)
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+
+                created, errors = self.import_batch(batch)
+                imported += created
+                rejected += errors
+
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"{imported} imported, {rejected} rejected ({imported / elapsed:.0f} rows/s)")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if imported:
+            # One rebuild for the whole file is far cheaper than scoring every imported row against the index.
+            if not options['skip_related']:
+                rebuild_related(self.model, term_model=SimilarityTerm)
+            bump_generation(self.model._meta.label_lower)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} {options['kind']} in {elapsed:.1f}s, rejected {rejected} rows."
+        ))
+
+    def reject(self, line, message):
+        self.stderr.write(f"Row {line}: {message}")
+
+    def import_batch(self, batch):
+        clubs = {}
+        if self.model is Competitions:
+            keys = {row.get('club', '') for line, row in batch}
+            for club in Club.objects.filter(slug__in=keys).only('id', 'slug', 'title'):
+                clubs[club.slug] = club
+            for club in Club.objects.filter(title__in=keys - set(clubs)).only('id', 'slug', 'title'):
+                clubs[club.title] = club
+
+        valid = []
+        errors = 0
+        for line, row in batch:
+            if isinstance(row, Exception):
+                self.reject(line, row)
+                errors += 1
+            else:
+                valid.append((line, row))
+        batch = valid
+
+        titles = [row.get('title', '') for line, row in batch]
+        existing_titles = set()
+        if self.model is not Competitions:
+            existing_titles = set(self.model.objects.filter(title__in=titles).values_list('title', flat=True))
+
+        instances = []
+        lines = []
+        m2m_names = []
+        for line, row in batch:
+            form = self.form_class(data=row)
+            if not form.is_valid():
+                self.reject(line, form.errors.as_text().replace('\n', ' '))
+                errors += 1
+                continue
+
+            instance = form.instance
+            if self.model is Competitions:
+                club = clubs.get(row.get('club', ''))
+                if club is None:
+                    self.reject(line, f"unknown club {row.get('club')!r}")
+                    errors += 1
+                    continue
+                instance.club = club
+            elif instance.title in existing_titles:
+                self.reject(line, f"{self.model.__name__} with title {instance.title!r} already exists")
+                errors += 1
+                continue
+            else:
+                existing_titles.add(instance.title)
+
+            if self.owner is not None:
+                instance.user = self.owner
+            instances.append(instance)
+            lines.append(line)
+            m2m_names.append(list(dict.fromkeys(split_names(row.get(self.m2m)))) if self.m2m else [])
+
+        if not instances:
+            return 0, errors
+
+        with transaction.atomic():
+            for instance, slug in zip(instances, reserve_slugs(self.model, [i.title for i in instances])):
+                instance.slug = slug
+            self.model.objects.bulk_create(instances, batch_size=self.batch_size)
+
+            if self.m2m:
+                self.add_m2m_rows(instances, lines, m2m_names)
+
+            index_objects(instances)
+
+        return len(instances), errors
+
+    def add_m2m_rows(self, instances, lines, m2m_names):
+        usernames = {name for names in m2m_names for name in names}
+        if not usernames:
+            return
+
+        user_ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        through = getattr(self.model, self.m2m).through
+        owner_field = f'{self.model._meta.model_name}_id'
+
+        wanted = []
+        for instance, line, names in zip(instances, lines, m2m_names):
+            for name in names:
+                if name in user_ids:
+                    wanted.append((instance.pk, user_ids[name], line, name))
+                else:
+                    self.reject(line, f"unknown {self.m2m} username {name!r}, skipped")
+
+        through.objects.bulk_create(
+            [through(**{owner_field: pk, 'user_id': user_id}) for pk, user_id, line, name in wanted],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+        # ignore_conflicts hides rows dropped by unique constraints, such as a user already in another club.
+        pks = [instance.pk for instance in instances]
+        added = set(through.objects.filter(**{f'{owner_field}__in': pks}).values_list(owner_field, 'user_id'))
+        for pk, user_id, line, name in wanted:
+            if (pk, user_id) not in added:
+                self.reject(line, f"{name!r} was not added to {self.m2m}: conflicts with an existing membership")
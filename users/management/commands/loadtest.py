@@ -0,0 +1,96 @@
+import http.cookiejar
+import re
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def login(base_url, username, password):
+    cookies = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+
+    page = opener.open(f'{base_url}/login/').read().decode()
+    match = CSRF_INPUT.search(page)
+    if not match:
+        raise CommandError("Could not find the CSRF token on the login page.")
+
+    data = urllib.parse.urlencode({
+        'csrfmiddlewaretoken': match.group(1),
+        'username': username,
+        'password': password,
+    }).encode()
+    response = opener.open(f'{base_url}/login/', data)
+    if response.geturl().rstrip('/').endswith('/login'):
+        raise CommandError(f"Could not log in as {username}.")
+
+    return '; '.join(f'{cookie.name}={cookie.value}' for cookie in cookies)
+
+
+def fetch(url, cookie, timeout):
+    request = urllib.request.Request(url, headers={'Cookie': cookie})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    except OSError:
+        status = None
+
+    return status, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Fire concurrent authenticated GET requests at a running server and report latency and throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help="Server root, e.g. http://127.0.0.1:8000")
+        parser.add_argument('paths', nargs='+', help="Paths to request in rotation, e.g. /posts/ /clubs/")
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        cookie = login(base_url, options['username'], options['password'])
+        urls = [f'{base_url}{path}' for path in options['paths']]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(
+                lambda url: fetch(url, cookie, options['timeout']),
+                islice(cycle(urls), options['requests']),
+            ))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for status, latency in results)
+        errors = sum(1 for status, latency in results if status != 200)
+
+        self.stdout.write(
+            f"{len(results)} requests, concurrency {options['concurrency']}, {elapsed:.2f}s "
+            f"({len(results) / elapsed:.1f} req/s)"
+        )
+        self.stdout.write(
+            f"latency ms: p50 {statistics.median(latencies) * 1000:.1f}, "
+            f"p95 {percentile(latencies, 0.95) * 1000:.1f}, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.1f}, "
+            f"max {latencies[-1] * 1000:.1f}"
+        )
+
+        if errors:
+            self.stdout.write(self.style.WARNING(f"{errors} requests did not return 200."))
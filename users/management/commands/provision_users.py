@@ -0,0 +1,208 @@
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from SoftUniFinalExam.generations import bump_generation
+from clubs.models import Club
+from users.models import Users
+
+PROFILE_FIELDS = ('username', 'first_name', 'last_name', 'email', 'phone')
+
+
+def hash_password(password):
+    return make_password(password or None)
+
+
+def max_lengths():
+    return {field: Users._meta.get_field(field).max_length for field in PROFILE_FIELDS}
+
+
+class Command(BaseCommand):
+    help = (
+        "Create accounts from a CSV roster (username, email, password, first_name, last_name, phone, club). "
+        "Passwords are hashed in a process pool and rows are bulk inserted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV file, or - for stdin.")
+        parser.add_argument('--group', default='user', help="Group every new account joins.")
+        parser.add_argument('--club', help="Slug or title of a club for rows without a club column.")
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Password hashing processes.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Validate the roster without creating anything.")
+
+    def handle(self, *args, **options):
+        self.batch_size = max(1, options['batch_size'])
+        self.dry_run = options['dry_run']
+        self.lengths = max_lengths()
+        self.workers = max(1, options['workers'])
+
+        try:
+            self.group = Group.objects.get(name=options['group'])
+        except Group.DoesNotExist:
+            raise CommandError(f"Group {options['group']!r} does not exist.")
+
+        self.clubs = {}
+        self.default_club = self.find_club(options['club']) if options['club'] else None
+        if options['club'] and self.default_club is None:
+            raise CommandError(f"Club {options['club']!r} does not exist.")
+
+        self.seen_usernames = set()
+        self.seen_emails = set()
+
+        stream = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+        created = rejected = 0
+        started = time.monotonic()
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=django.setup) as pool:
+                rows = enumerate(csv.DictReader(stream), start=2)
+                while True:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+
+                    accepted, errors = self.validate_batch(batch)
+                    rejected += errors
+                    if accepted and not self.dry_run:
+                        created += self.create_batch(accepted, pool)
+
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(f"{created} created, {rejected} rejected ({created / elapsed:.0f} accounts/s)")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if created:
+            bump_generation(Users._meta.label_lower)
+            bump_generation(Club._meta.label_lower)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} accounts in {elapsed:.1f}s, rejected {rejected} rows."
+        ))
+
+    def reject(self, line, message):
+        self.stderr.write(f"Row {line}: {message}")
+
+    def find_club(self, key):
+        if key not in self.clubs:
+            self.clubs[key] = (
+                Club.objects.filter(slug=key).only('id').first()
+                or Club.objects.filter(title=key).only('id').first()
+            )
+        return self.clubs[key]
+
+    def validate_batch(self, batch):
+        rows = [(line, {key: (value or '').strip() for key, value in row.items() if key}) for line, row in batch]
+        usernames = [row.get('username', '') for line, row in rows]
+        emails = {email for line, row in rows for email in (row.get('email', ''), row.get('email', '').lower())}
+
+        taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_usernames |= set(Users.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_emails = {email.lower() for email in User.objects.filter(email__in=emails).values_list('email', flat=True)}
+        taken_emails |= {email.lower() for email in Users.objects.filter(email__in=emails).values_list('email', flat=True)}
+
+        accepted = []
+        errors = 0
+        for line, row in rows:
+            message = self.check_row(row, taken_usernames, taken_emails)
+            if message:
+                self.reject(line, message)
+                errors += 1
+                continue
+
+            self.seen_usernames.add(row['username'])
+            self.seen_emails.add(row['email'].lower())
+            accepted.append(row)
+
+        return accepted, errors
+
+    def check_row(self, row, taken_usernames, taken_emails):
+        username = row.get('username', '')
+        email = row.get('email', '')
+
+        if not username:
+            return "username is required"
+        try:
+            User.username_validator(username)
+            validate_email(email)
+        except ValidationError as error:
+            return ' '.join(error.messages)
+
+        if username in taken_usernames or username in self.seen_usernames:
+            return f"username {username!r} is already taken"
+        if email.lower() in taken_emails or email.lower() in self.seen_emails:
+            return f"email {email!r} is already registered"
+
+        for field, max_length in self.lengths.items():
+            if len(row.get(field, '')) > max_length:
+                return f"{field} is longer than {max_length} characters"
+
+        club_key = row.get('club')
+        if club_key:
+            row['club'] = self.find_club(club_key)
+            if row['club'] is None:
+                return f"unknown club {club_key!r}"
+        else:
+            row['club'] = self.default_club
+
+        return None
+
+    def create_batch(self, rows, pool):
+        chunksize = max(1, len(rows) // (self.workers * 4))
+        passwords = list(pool.map(hash_password, [row.get('password') for row in rows], chunksize=chunksize))
+
+        users = [
+            User(
+                username=row['username'],
+                email=row['email'],
+                first_name=row.get('first_name', ''),
+                last_name=row.get('last_name', ''),
+                password=password,
+            )
+            for row, password in zip(rows, passwords)
+        ]
+
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=self.batch_size)
+            if any(user.pk is None for user in users):
+                ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id'))
+                for user in users:
+                    user.pk = ids[user.username]
+
+            Users.objects.bulk_create([
+                Users(
+                    user=user,
+                    username=user.username,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    email=user.email,
+                    phone=row.get('phone', ''),
+                )
+                for user, row in zip(users, rows)
+            ], batch_size=self.batch_size)
+
+            groups = User.groups.through
+            groups.objects.bulk_create(
+                [groups(user_id=user.pk, group_id=self.group.pk) for user in users],
+                batch_size=self.batch_size,
+            )
+
+            members = Club.members.through
+            members.objects.bulk_create(
+                [members(user_id=user.pk, club_id=row['club'].pk) for user, row in zip(users, rows) if row['club']],
+                batch_size=self.batch_size,
+            )
+
+        return len(users)
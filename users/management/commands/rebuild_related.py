@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from SoftUniFinalExam.similarity import rebuild_related
+from clubs.models import Club
+from competitions.models import Competitions
+from posts.models import Post
+from search.models import SimilarityTerm
+
+
+class Command(BaseCommand):
+    help = "Rebuild the related posts, clubs and competitions similarity index from scratch."
+
+    def handle(self, *args, **options):
+        for model in (Post, Club, Competitions):
+            changed = rebuild_related(model, term_model=SimilarityTerm)
+            self.stdout.write(f"{model.__name__}: updated {changed} rows")
+
+        self.stdout.write(self.style.SUCCESS("Similarity index rebuilt."))
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from users.profile_sync import sync_profiles
+
+
+class Command(BaseCommand):
+    help = "Copy username, names and email from auth users to their profiles after bulk updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', action='append', dest='usernames', help="Only sync this user; repeatable.")
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+
+        updated = sync_profiles(users)
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} profiles."))
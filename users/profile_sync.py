@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.db.models import F, OuterRef, Q, Subquery
+
+from SoftUniFinalExam.generations import bump_generation
+from users.models import Users
+
+MIRRORED_FIELDS = ('username', 'first_name', 'last_name', 'email')
+
+_missing = object()
+
+
+def remember_mirrored(user):
+    user._mirrored = {field: user.__dict__.get(field, _missing) for field in MIRRORED_FIELDS}
+
+
+def changed_fields(user, update_fields=None):
+    fields = MIRRORED_FIELDS if update_fields is None else [f for f in MIRRORED_FIELDS if f in update_fields]
+    original = getattr(user, '_mirrored', {})
+    return [field for field in fields if original.get(field, _missing) != user.__dict__.get(field)]
+
+
+def sync_profile(user, update_fields=None):
+    fields = changed_fields(user, update_fields)
+    if not fields:
+        return 0
+
+    updated = Users.objects.filter(user=user).update(**{field: getattr(user, field) for field in fields})
+    remember_mirrored(user)
+    if updated:
+        bump_generation(Users._meta.label_lower)
+    return updated
+
+
+def sync_profiles(users=None):
+    users = User.objects.all() if users is None else users
+    source = User.objects.filter(pk=OuterRef('user_id'))
+
+    stale = Q()
+    for field in MIRRORED_FIELDS:
+        stale |= ~Q(**{field: F(f'user__{field}')})
+
+    updated = (
+        Users.objects
+        .filter(user__in=users.values('pk'))
+        .filter(stale)
+        .update(**{field: Subquery(source.values(field)[:1]) for field in MIRRORED_FIELDS})
+    )
+    if updated:
+        bump_generation(Users._meta.label_lower)
+    return updated
@@ -0,0 +1,27 @@
+from asgiref.sync import sync_to_async
+
+from users.models import Users
+
+
+def get_profile(user):
+    if not user.is_authenticated:
+        return None
+
+    try:
+        return user.users
+    except Users.DoesNotExist:
+        return None
+
+
+async def aget_profile(user):
+    return await sync_to_async(get_profile)(user)
+
+
+class ProfileFormMixin:
+    def form_valid(self, form):
+        profile = get_profile(self.request.user)
+        if profile is None:
+            raise ValueError("No corresponding Users instance found for the logged-in user.")
+
+        form.instance.user = profile
+        return super().form_valid(form)
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+
+from SoftUniFinalExam.routers import primary_reads
+
+ROLES_CACHE_KEY = 'user_roles:{}'
+ROLES_CACHE_TIMEOUT = 60 * 15
+
+
+def _cache_key(user_id):
+    return ROLES_CACHE_KEY.format(user_id)
+
+
+def get_user_roles(user):
+    if not user.is_authenticated:
+        return frozenset()
+
+    roles = getattr(user, '_cached_roles', None)
+    if roles is None:
+        roles = cache.get(_cache_key(user.pk))
+        if roles is None:
+            with primary_reads():
+                roles = frozenset(user.groups.values_list('name', flat=True))
+            cache.set(_cache_key(user.pk), roles, ROLES_CACHE_TIMEOUT)
+        user._cached_roles = roles
+
+    return roles
+
+
+def has_any_role(user, allowed_roles):
+    return not get_user_roles(user).isdisjoint(allowed_roles)
+
+
+def invalidate_user_roles(user):
+    user_id = getattr(user, 'pk', user)
+    cache.delete(_cache_key(user_id))
+
+    if hasattr(user, '_cached_roles'):
+        del user._cached_roles
@@ -1,3 +1,848 @@
-from django.test import TestCase
+import base64
+import datetime
+import importlib
+import os
+import shutil
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, router
+from django.db.models import Count, Q
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from psycopg2 import OperationalError, extensions
+
+from SoftUniFinalExam import metrics, settings as project_settings, timing
+from SoftUniFinalExam.generations import bump_generation
+from SoftUniFinalExam.middleware import QueryBudgetExceeded
+from SoftUniFinalExam.pooled_postgresql.base import ConnectionPool
+from SoftUniFinalExam.routers import STICKY_COOKIE, ReplicaStickinessMiddleware, primary_reads
+from clubs import membership
+from clubs.models import Club
+from competitions.models import Competitions
+from posts.models import Post
+from registration.models import Registration
+from search.models import SimilarityTerm
+from users import throttling
+from users.management.commands.advise_indexes import Command as AdviseIndexesCommand
+from users.models import Users
+from users.profile_sync import sync_profiles
+from users.profiles import get_profile
+from users.roles import get_user_roles, has_any_role
+from users.urls import QUERY_BUDGETS
+
+
+class UserRolesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_roles_load_once_per_request_and_then_come_from_the_cache(self):
+        template = Template("{% load user_tags %}{% if user|in_group:'user' %}member{% endif %}")
+        user = User.objects.get(pk=self.user.pk)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(has_any_role(user, ['admin', 'user']))
+            self.assertFalse(has_any_role(user, ['staff']))
+            self.assertEqual(template.render(Context({'user': user})), 'member')
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_roles(user), {'user'})
+
+    def test_group_changes_drop_cached_roles(self):
+        get_user_roles(self.user)
+        staff = Group.objects.create(name='staff')
+
+        self.user.groups.add(staff)
+        self.assertEqual(get_user_roles(User.objects.get(pk=self.user.pk)), {'user', 'staff'})
+
+        staff.user_set.remove(self.user)
+        self.assertEqual(get_user_roles(User.objects.get(pk=self.user.pk)), {'user'})
+
+    def test_view_requests_fill_the_shared_cache(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('posts')).status_code, 200)
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(has_any_role(user, ['user']))
+
+
+@override_settings(QUERY_BUDGET_STRICT=True, SERVER_TIMING_SAMPLE_RATE=0)
+class QueryBudgetTests(TestCase):
+    list_views = ('user-home', 'profile', 'posts', 'clubs', 'competitions')
+
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(name='user')
+        cls.user = User.objects.create_user(username='climber', email='climber@example.com', password='password')
+        cls.user.groups.add(group)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_content(self, count):
+        profile = self.user.users
+        start = Post.objects.count()
+
+        for i in range(start, start + count):
+            Post.objects.create(
+                title=f"Climbing post {i}",
+                image_url='https://example.com/post.jpg',
+                content="Bouldering session notes",
+                user=profile,
+            )
+            club = Club.objects.create(
+                title=f"Climbing club {i}",
+                image='https://example.com/club.jpg',
+                content="Weekly bouldering meetups",
+                owner="Owner",
+                user=profile,
+            )
+            competition = Competitions.objects.create(
+                title=f"Bouldering Cup {i}",
+                date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i),
+                context="Open category",
+                club=club,
+            )
+            competition.participants.add(self.user)
+
+    def count_queries(self, url_name, *args):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name, args=args))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(queries), QUERY_BUDGETS[url_name], url_name)
+        return len(queries)
+
+    def test_list_views_query_count_does_not_grow_with_rows(self):
+        self.create_content(2)
+        before = {url_name: self.count_queries(url_name) for url_name in self.list_views}
+
+        self.create_content(10)
+        after = {url_name: self.count_queries(url_name) for url_name in self.list_views}
+
+        self.assertEqual(before, after)
+
+    def test_detail_views_stay_within_budget(self):
+        self.create_content(5)
+
+        self.count_queries('post_detail', Post.objects.first().slug)
+        self.count_queries('club_detail', Club.objects.first().slug)
+        self.count_queries('competition_detail', Competitions.objects.first().slug)
+
+    async def test_async_requests_are_counted(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        with mock.patch.dict(QUERY_BUDGETS, {'posts': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                await self.async_client.get(reverse('posts'))
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+        for i in range(3):
+            Post.objects.create(
+                title=f"Climbing post {i}",
+                image_url='https://example.com/post.jpg',
+                content="Bouldering session notes",
+                user=cls.user.users,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_posts(self, **params):
+        return self.client.get(reverse('posts'), {'page_size': 2, **params})
+
+    def test_next_cursor_continues_the_listing(self):
+        first = self.get_posts()
+        second = self.get_posts(after=first.context['page_obj'].next_cursor)
+
+        titles = [post.title for page in (first, second) for post in page.context['posts']]
+        self.assertEqual(titles, ["Climbing post 2", "Climbing post 1", "Climbing post 0"])
+        self.assertFalse(second.context['page_obj'].has_next)
+
+    def test_malformed_cursors_are_not_found(self):
+        payloads = [b'[{"a":1},1]', b'[null,1]', b'["yesterday",1]', b'[1]', b'{"id":1}']
+        cursors = ['!!!', *(base64.urlsafe_b64encode(payload).decode().rstrip('=') for payload in payloads)]
+
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.get_posts(after=cursor).status_code, 404)
+
+
+class AdminPanelTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='admin', password='password')
+        cls.staff.groups.add(Group.objects.create(name='staff'))
+        Post.objects.bulk_create([
+            Post(
+                title=title,
+                slug=f'post-{i}',
+                image_url='https://example.com/post.jpg',
+                content="Bouldering session notes",
+                user=cls.staff.users,
+            )
+            for i, title in enumerate([*(f"Crag report {i}" for i in range(25)), "Ice climbing"])
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_panel_page_does_not_load_sections(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin-panel'))
+
+        self.assertEqual(response.status_code, 200)
+        tables = ('posts_post', 'clubs_club', 'competitions_competitions', 'registration_registration')
+        self.assertFalse([query for query in queries if any(table in query['sql'] for table in tables)])
+
+    def test_sections_are_paged_and_filtered_on_the_server(self):
+        url = reverse('admin-panel-section', args=['posts'])
+        first = self.client.get(url)
+        second = self.client.get(url, {'after': first.context['page_obj'].next_cursor})
+
+        self.assertEqual((len(first.context['page_obj']), len(second.context['page_obj'])), (20, 6))
+        self.assertFalse(second.context['page_obj'].has_next)
+
+        filtered = self.client.get(url, {'q': 'ice'})
+        self.assertEqual([post.title for post in filtered.context['page_obj']], ["Ice climbing"])
+
+    def test_unknown_section_is_not_found(self):
+        self.assertEqual(self.client.get(reverse('admin-panel-section', args=['secrets'])).status_code, 404)
+
+
+class ClubAdminPanelTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(username='admin', password='password')
+        cls.staff.groups.add(Group.objects.create(name='staff'))
+        cls.crag, cls.gym = [cls.create_club(title) for title in ("Crag club", "Gym club")]
+
+        members = User.objects.bulk_create([User(username=f'member{i:02}') for i in range(32)])
+        cls.crag.members.add(*members[:30])
+        cls.gym.members.add(*members[30:])
+
+    @classmethod
+    def create_club(cls, title):
+        return Club.objects.create(
+            title=title,
+            image='https://example.com/club.jpg',
+            content="Weekly bouldering meetups",
+            owner="Owner",
+            user=cls.staff.users,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def get_panel(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_club_panel'))
+        return response, len(queries)
+
+    def test_member_counts_do_not_cost_a_query_per_club(self):
+        response, queries = self.get_panel()
+        counts = {club.title: club.member_count for club in response.context['clubs']}
+        self.assertEqual(counts, {"Crag club": 30, "Gym club": 2})
+
+        for i in range(3):
+            self.create_club(f"New club {i}")
+        self.assertEqual(self.get_panel()[1], queries)
+
+    def test_member_list_is_paged_and_filtered(self):
+        url = reverse('admin_club_members', args=[self.crag.pk])
+        first = self.client.get(url)
+        second = self.client.get(url, {'after': first.context['page_obj'].next_cursor})
+
+        self.assertEqual((len(first.context['page_obj']), len(second.context['page_obj'])), (25, 5))
+        filtered = self.client.get(url, {'q': 'member07'})
+        self.assertEqual([member.username for member in filtered.context['page_obj']], ['member07'])
+
+
+class FragmentCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+        cls.boulder, cls.overhang = [
+            Post.objects.create(
+                title=title,
+                image_url='https://example.com/post.jpg',
+                content="Steep overhang bouldering problems",
+                user=cls.user.users,
+            )
+            for title in ("Bouldering wall", "Overhang session")
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_related_sidebar_is_reused_until_the_generation_changes(self):
+        url = reverse('post_detail', args=[self.boulder.slug])
+        self.assertContains(self.client.get(url), "Overhang session")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertContains(self.client.get(url), "Overhang session")
+        self.assertEqual([query for query in queries if 'posts_post' in query['sql'] and ' IN (' in query['sql']], [])
+
+        self.overhang.title = "Overhang night session"
+        self.overhang.save()
+        self.assertContains(self.client.get(url), "Overhang night session")
+
+    def test_listing_cards_are_reused_until_the_generation_changes(self):
+        self.client.get(reverse('posts'))
+        Post.objects.filter(pk=self.boulder.pk).update(title="Renamed wall")
+        self.assertContains(self.client.get(reverse('posts')), "Bouldering wall")
+
+        bump_generation('posts.post')
+        self.assertContains(self.client.get(reverse('posts')), "Renamed wall")
+
+
+class CacheSessionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def session_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts'))
+
+        self.assertEqual(response.status_code, 200)
+        return [query for query in queries if 'django_session' in query['sql']]
+
+    def test_sessions_are_read_from_the_cache(self):
+        self.assertEqual(self.session_queries(), [])
+
+    def test_sessions_fall_back_to_the_database(self):
+        cache.clear()
+        self.assertEqual(len(self.session_queries()), 1)
+        self.assertEqual(self.session_queries(), [])
+
+    def test_cache_is_configured_from_the_environment(self):
+        environment = {'CACHE_BACKEND': 'file', 'CACHE_TIMEOUT': '60', 'SESSION_ENGINE': 'django.contrib.sessions.backends.db'}
+        self.addCleanup(importlib.reload, project_settings)
+        with mock.patch.dict(os.environ, environment):
+            importlib.reload(project_settings)
+
+        cache_config = project_settings.CACHES['default']
+        self.assertEqual(cache_config['BACKEND'], 'SoftUniFinalExam.cache.FileBasedCache')
+        self.assertEqual(cache_config['TIMEOUT'], 60)
+        self.assertEqual(project_settings.SESSION_ENGINE, 'django.contrib.sessions.backends.db')
+
+
+class GenerateDataTests(TestCase):
+    @mock.patch('users.management.commands.generate_data.CAPACITIES', (5,))
+    def test_generates_consistent_dataset(self):
+        call_command('generate_data', scale=200, prefix='t', stdout=StringIO())
+
+        self.assertEqual(User.objects.filter(username__startswith='t-').count(), 200)
+        self.assertEqual(Post.objects.count(), 200)
+        self.assertEqual(Club.objects.count(), 4)
+        self.assertEqual(Competitions.objects.count(), 10)
+        self.assertFalse(User.objects.annotate(clubs=Count('joined_clubs')).filter(clubs__gt=1).exists())
+
+        admitted = Count('registrations', filter=Q(registrations__status=Registration.Status.ADMITTED))
+        for competition in Competitions.objects.annotate(admitted=admitted, total=Count('registrations')):
+            self.assertEqual(competition.registered_count, competition.admitted)
+            self.assertEqual(competition.admitted, min(competition.total, 5))
+        self.assertTrue(Registration.objects.filter(status=Registration.Status.WAITLISTED).exists())
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+class ServerTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+
+    def test_sampled_request_reports_timings(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('posts'))
+
+        metrics = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['db', 'perm', 'render', 'total'])
+        self.assertNotContains(response, 'class="server-timing"')
+
+    def test_staff_get_footer(self):
+        self.user.groups.add(Group.objects.create(name='staff'))
+        self.client.force_login(self.user)
+
+        self.assertContains(self.client.get(reverse('posts')), 'class="server-timing"')
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_request_has_no_header(self):
+        self.assertFalse(self.client.get(reverse('about')).has_header('Server-Timing'))
+
+    def test_unsampled_requests_only_count_queries(self):
+        with timing.timed_request(detailed=False) as timer:
+            with timing.segment('perm'):
+                User.objects.count()
+
+        self.assertEqual(timer.queries, 1)
+        self.assertEqual(dict(timer.durations), {})
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.client.force_login(self.user)
+
+    def scrape(self):
+        self.user.groups.add(Group.objects.get_or_create(name='staff')[0])
+        response = self.client.get(reverse('admin-metrics'))
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        return response.content.decode()
+
+    def test_endpoint_requires_staff(self):
+        response = self.client.get(reverse('admin-metrics'))
+        self.assertContains(response, "You are not allowed to access this page.")
+
+    def test_records_routes_cache_and_sessions(self):
+        self.client.get(reverse('posts'))
+        self.client.get(reverse('posts'))
+        body = self.scrape()
+
+        self.assertIn('http_request_duration_seconds_count{route="posts"} 2', body)
+        self.assertIn('http_request_queries_bucket{route="posts",le="+Inf"} 2', body)
+        self.assertIn('http_requests_total{method="GET",route="posts",status="2xx"} 2', body)
+        self.assertIn('cache_requests_total{backend="LocMemCache",result="hit"}', body)
+        self.assertIn('session_operation_duration_seconds_count{operation="load"}', body)
+
+    def test_merges_process_files(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            metrics.registry.observe('http_request_duration_seconds', {'route': 'clubs'}, 0.02)
+            metrics.registry.flush(force=True)
+            shutil.copy(os.path.join(directory, f'{os.getpid()}.json'), os.path.join(directory, '1.json'))
+
+            body = metrics.render(metrics.registry.snapshots())
+
+        self.assertIn('http_request_duration_seconds_bucket{route="clubs",le="0.025"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{route="clubs"} 2', body)
+
+    def test_parallel_flushes_do_not_collide(self):
+        errors = []
+
+        def flush():
+            try:
+                for _ in range(20):
+                    metrics.registry.flush(force=True)
+            except Exception as error:
+                errors.append(error)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            threads = [threading.Thread(target=flush) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(os.listdir(directory), [f'{os.getpid()}.json'])
+        self.assertEqual(errors, [])
+
+    def test_flush_errors_do_not_fail_requests(self):
+        with mock.patch.object(metrics.registry, 'flush', side_effect=OSError("disk full")):
+            with self.assertLogs('SoftUniFinalExam.middleware', 'ERROR'):
+                response = self.client.get(reverse('posts'))
+
+        self.assertEqual(response.status_code, 200)
+
+
+class ImportContentTests(TestCase):
+    def test_bad_lines_and_dropped_members_are_reported(self):
+        User.objects.create_user(username='owner', password='password')
+        User.objects.create_user(username='ann', password='password')
+        User.objects.create_user(username='bob', password='password')
+
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as source:
+            source.write(
+                '{"title": "Crag club", "image": "https://example.com/a.jpg", "content": "Sport climbing crag trips", '
+                '"owner": "Ann", "members": "ann;ghost;ann"}\n'
+                '{broken\n'
+                '{"title": "Boulder club", "image": "https://example.com/b.jpg", "content": "Indoor climbing sessions", '
+                '"owner": "Bob", "members": ["ann", "bob"]}\n'
+            )
+        self.addCleanup(os.remove, source.name)
+
+        output, errors = StringIO(), StringIO()
+        call_command('import_content', 'clubs', source.name, owner='owner', stdout=output, stderr=errors)
+
+        self.assertIn("Imported 2 clubs", output.getvalue())
+        self.assertIn("rejected 1 rows", output.getvalue())
+        self.assertIn("Row 1: unknown members username 'ghost', skipped", errors.getvalue())
+        self.assertIn("Row 2: invalid JSON", errors.getvalue())
+        self.assertIn("Row 3: 'ann' was not added to members", errors.getvalue())
+
+        crag, boulder = Club.objects.get(title="Crag club"), Club.objects.get(title="Boulder club")
+        self.assertEqual(list(crag.members.values_list('username', flat=True)), ['ann'])
+        self.assertEqual(list(boulder.members.values_list('username', flat=True)), ['bob'])
+        self.assertEqual([pk for pk, score in crag.related], [boulder.pk])
+
+        self.assertTrue(SimilarityTerm.objects.filter(kind='clubs.club', object_id=crag.pk).exists())
+        copy = Club.objects.create(
+            title="Crag club copy", image='https://example.com/c.jpg', content="Sport climbing crag trips",
+            owner="Ann", user=crag.user,
+        )
+        self.assertEqual(copy.related[0][0], crag.pk)
+
+
+class AdviseIndexesTests(TestCase):
+    def test_failed_explain_is_reported_and_later_plans_still_run(self):
+        command = AdviseIndexesCommand(stderr=StringIO())
+        command.connection = connection
+
+        self.assertIsNone(command.sequential_scans('SELECT * FROM missing_table'))
+        self.assertIn("EXPLAIN failed", command.stderr.getvalue())
+        self.assertIsNotNone(command.sequential_scans('SELECT * FROM "posts_post"'))
+
+    def test_migrations_are_only_written_for_project_apps(self):
+        command = AdviseIndexesCommand()
+        self.assertTrue(command.is_project_app('posts'))
+        self.assertFalse(command.is_project_app('auth'))
+
+
+class ProfileSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', email='climber@example.com', password='password')
+
+    def test_login_does_not_touch_profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.client.login(username='climber', password='password'))
+
+        self.assertFalse([query for query in queries if 'users_users' in query['sql']])
+
+    def test_only_changed_fields_are_written(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_staff = True
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertEqual(len(queries), 1)
+
+        user.email = 'new@example.com'
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"email"', queries[1]['sql'])
+        self.assertNotIn('"username"', queries[1]['sql'])
+        self.assertEqual(Users.objects.get(user=user).email, 'new@example.com')
+
+    def test_bulk_sync(self):
+        User.objects.filter(pk=self.user.pk).update(first_name='Alex', last_name='Honnold')
+
+        self.assertEqual(sync_profiles(), 1)
+        self.assertEqual(sync_profiles(), 0)
+        profile = Users.objects.get(user=self.user)
+        self.assertEqual((profile.first_name, profile.last_name), ('Alex', 'Honnold'))
+
+
+class ProfileLoaderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', email='climber@example.com', password='password')
+        cls.user.groups.add(Group.objects.create(name='user'))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_profile_page_does_not_create_profile(self):
+        Users.objects.filter(user=self.user).delete()
+
+        response = self.client.get(reverse('profile'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Users.objects.filter(user=self.user).exists())
+
+    def test_create_post_loads_profile_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('create_post'), {
+                'title': "Morning session",
+                'image_url': 'https://example.com/post.jpg',
+                'content': "Bouldering session notes",
+            })
+
+        post = Post.objects.get(title="Morning session")
+        self.assertEqual(post.user, self.user.users)
+        self.assertEqual(len([query for query in queries if 'FROM "users_users"' in query['sql']]), 1)
+
+    def test_profile_is_loaded_once_per_user_object(self):
+        user = User.objects.get(pk=self.user.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_profile(user).username, 'climber')
+            self.assertIs(get_profile(user), get_profile(user))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ProvisionUsersTests(TestCase):
+    def test_roster_creates_synced_accounts(self):
+        Group.objects.create(name='user')
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='password')
+        club = Club.objects.create(
+            title="Climbing club",
+            image='https://example.com/club.jpg',
+            content="Weekly bouldering meetups",
+            owner="Owner",
+            user=owner.users,
+        )
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as roster:
+            roster.write(
+                "username,email,password,first_name,last_name,phone,club\n"
+                f"ann,ann@example.com,Secret-pass1,Ann,Lee,0888123456,{club.slug}\n"
+                "bob,bob@example.com,,Bob,Ray,,\n"
+                "carl,OWNER@example.com,Secret-pass1,,,,\n"
+            )
+        self.addCleanup(os.remove, roster.name)
+
+        errors = StringIO()
+        call_command('provision_users', roster.name, workers=1, stdout=StringIO(), stderr=errors)
+
+        self.assertIn("Row 4: email 'OWNER@example.com' is already registered", errors.getvalue())
+        ann = User.objects.get(username='ann')
+        self.assertTrue(ann.check_password('Secret-pass1'))
+        self.assertFalse(User.objects.get(username='bob').has_usable_password())
+        self.assertEqual(list(ann.groups.values_list('name', flat=True)), ['user'])
+        self.assertEqual(membership.club_of(ann.id), club.id)
+
+        profile = Users.objects.get(user=ann)
+        self.assertEqual((profile.username, profile.email, profile.phone), ('ann', 'ann@example.com', '0888123456'))
+        self.assertEqual(Users.objects.count(), User.objects.count())
+
+
+@override_settings(LOGIN_THROTTLE_USERNAME_LIMIT=3, LOGIN_THROTTLE_IP_LIMIT=5)
+class LoginThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='climber', password='password')
+
+    def setUp(self):
+        cache.clear()
+
+    def attempt(self, username='climber', password='wrong', ip='10.0.0.1'):
+        return self.client.post(reverse('login'), {'username': username, 'password': password}, REMOTE_ADDR=ip)
+
+    def test_username_is_locked_out_after_failures(self):
+        for _ in range(3):
+            self.assertEqual(self.attempt().status_code, 200)
+
+        with mock.patch('users.views.authenticate') as authenticate:
+            response = self.attempt(password='password', ip='10.0.0.2')
+
+        authenticate.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(int(response['Retry-After']) > 0)
+        self.assertEqual(self.attempt(username='someone-else', ip='10.0.0.2').status_code, 200)
+
+    def test_ip_is_limited_across_usernames(self):
+        for number in range(5):
+            self.assertEqual(self.attempt(username=f'guess{number}').status_code, 200)
+
+        self.assertEqual(self.attempt(username='climber', password='password').status_code, 429)
+        self.assertEqual(self.attempt(username='climber', password='password', ip='10.0.0.9').status_code, 302)
+
+    def test_success_resets_username_failures(self):
+        self.attempt()
+        self.attempt()
+        self.assertEqual(self.attempt(password='password').status_code, 302)
+        self.client.logout()
+
+        self.attempt(ip='10.0.0.2')
+        self.attempt(ip='10.0.0.2')
+        self.assertEqual(self.attempt(password='password', ip='10.0.0.2').status_code, 302)
+
+    @override_settings(LOGIN_THROTTLE_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_spoofed_forwarded_for_does_not_bypass_ip_limit(self):
+        for number in range(5):
+            response = self.client.post(
+                reverse('login'),
+                {'username': f'guess{number}', 'password': 'wrong'},
+                HTTP_X_FORWARDED_FOR=f'1.2.3.{number}, 10.0.0.1',
+            )
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(
+            reverse('login'), {'username': 'climber', 'password': 'password'}, HTTP_X_FORWARDED_FOR='1.2.3.99, 10.0.0.1',
+        )
+        self.assertEqual(response.status_code, 429)
+
+        with override_settings(LOGIN_THROTTLE_TRUSTED_PROXIES=2):
+            request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='1.2.3.4, 10.0.0.1, 172.16.0.1')
+            self.assertEqual(throttling.client_ip(request), '10.0.0.1')
+
+
+class ResponsiveImageTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        os.makedirs(os.path.join(self.root, 'images'))
+        Image.new('RGB', (800, 400), 'teal').save(os.path.join(self.root, 'images', 'photo.jpg'))
+
+    def test_variants_and_markup(self):
+        with override_settings(STATICFILES_DIRS=[self.root]):
+            call_command('build_image_variants', widths='320,1200', formats='webp', stdout=StringIO())
+            variants = sorted(os.listdir(os.path.join(self.root, 'images', 'variants')))
+            self.assertEqual(variants, ['manifest.json', 'photo-jpg-320.webp', 'photo-jpg-800.webp'])
+
+            output = StringIO()
+            call_command('build_image_variants', widths='320,1200', formats='webp', stdout=output)
+            self.assertIn("Wrote 0 variants", output.getvalue())
+
+            html = Template(
+                "{% load image_tags %}"
+                "{% responsive_image 'images/photo.jpg' alt='Photo' sizes='300px' class='post' %}"
+                "{% responsive_image 'images/missing.jpg' alt='Missing' %}"
+            ).render(Context())
+
+            os.remove(os.path.join(self.root, 'images', 'variants', 'manifest.json'))
+            self.assertIn('photo-jpg-320.webp', Template(
+                "{% load image_tags %}{% responsive_image 'images/photo.jpg' alt='Photo' %}"
+            ).render(Context()))
+
+        self.assertIn(
+            '<source type="image/webp" srcset="/static/images/variants/photo-jpg-320.webp 320w, '
+            '/static/images/variants/photo-jpg-800.webp 800w" sizes="300px">',
+            html,
+        )
+        self.assertIn('loading="lazy" decoding="async" class="post" width="800" height="400"', html)
+        self.assertIn('background: url(data:image/webp;base64,', html)
+        self.assertIn('<img src="/static/images/missing.jpg" alt="Missing" loading="lazy" decoding="async">', html)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+
+    def get_transaction_status(self):
+        return extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_reuses_connections_up_to_max_size(self):
+        pool = ConnectionPool('default', max_size=2, timeout=0.05, check_after=30)
+
+        first = pool.acquire(FakeConnection)
+        second = pool.acquire(FakeConnection)
+        with self.assertRaises(OperationalError):
+            pool.acquire(FakeConnection)
+
+        pool.release(first)
+        self.assertIs(pool.acquire(FakeConnection), first)
+        pool.release(second)
+
+        stats = pool.stats()
+        self.assertEqual(stats['created'], 2)
+        self.assertEqual(stats['checkouts'], 4)
+        self.assertEqual((stats['waits'], stats['timeouts']), (1, 1))
+        self.assertEqual((stats['in_use'], stats['idle']), (1, 1))
+
+    def test_waiting_checkout_gets_released_connection(self):
+        pool = ConnectionPool('default', max_size=1, timeout=5, check_after=30)
+        connection = pool.acquire(FakeConnection)
+        threading.Timer(0.05, pool.release, args=(connection,)).start()
+
+        self.assertIs(pool.acquire(FakeConnection), connection)
+        self.assertEqual(pool.stats()['waits'], 1)
+
+    def test_closed_connections_are_replaced(self):
+        pool = ConnectionPool('default', max_size=1, timeout=0.05, check_after=30)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        connection.close()
+
+        self.assertIsNot(pool.acquire(FakeConnection), connection)
+        self.assertEqual(pool.stats()['reconnects'], 1)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], REPLICA_STICKY_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    def route(self, request, write=False):
+        aliases = []
+
+        def view(request):
+            aliases.append(router.db_for_read(Post))
+            if write:
+                router.db_for_write(Post)
+                aliases.append(router.db_for_read(Post))
+            return HttpResponse()
+
+        response = ReplicaStickinessMiddleware(view)(request)
+        return aliases, response
+
+    def test_reads_go_to_replica_until_user_writes(self):
+        factory = RequestFactory()
+
+        aliases, response = self.route(factory.get('/posts/'))
+        self.assertEqual(aliases, ['replica_1'])
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+        aliases, response = self.route(factory.post('/1/join/'))
+        self.assertEqual(aliases, ['default'])
+        self.assertEqual(response.cookies[STICKY_COOKIE]['max-age'], 10)
+
+        pinned = factory.get('/club/club-1/')
+        pinned.COOKIES[STICKY_COOKIE] = response.cookies[STICKY_COOKIE].value
+        self.assertEqual(self.route(pinned)[0], ['default'])
+
+    def test_write_during_get_pins_rest_of_request(self):
+        aliases, response = self.route(RequestFactory().get('/profile/'), write=True)
+
+        self.assertEqual(aliases, ['replica_1', 'default'])
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    def test_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Post), 'default')
+
+    def test_fragment_refills_read_from_primary(self):
+        cache.clear()
+        fragment = Template(
+            "{% load fragment_tags %}{% primary_cache 60 sidebar %}{{ read }}{% endprimary_cache %}{{ read }}"
+        )
+        bump_generation('posts.post')
+
+        def view(request):
+            return HttpResponse(fragment.render(Context({'read': lambda: router.db_for_read(Post)})))
+
+        response = ReplicaStickinessMiddleware(view)(RequestFactory().get('/posts/'))
+        self.assertEqual(response.content, b'defaultreplica_1')
+
+        def view(request):
+            with primary_reads():
+                return HttpResponse(router.db_for_read(Group))
+
+        response = ReplicaStickinessMiddleware(view)(RequestFactory().get('/profile/'))
+        self.assertEqual(response.content, b'default')
@@ -0,0 +1,100 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from SoftUniFinalExam.metrics import registry
+
+COUNTER_KEY = 'login_throttle:{}:{}:{}'
+LOCKOUT_KEY = 'login_lockout:{}:{}'
+
+
+def client_ip(request):
+    if settings.LOGIN_THROTTLE_IP_HEADER == 'REMOTE_ADDR':
+        return request.META.get('REMOTE_ADDR', '')
+
+    # Clients can prepend anything; only the entries appended by our own proxies are trustworthy.
+    entries = [entry.strip() for entry in request.META.get(settings.LOGIN_THROTTLE_IP_HEADER, '').split(',')]
+    entries = [entry for entry in entries if entry]
+    trusted = max(1, settings.LOGIN_THROTTLE_TRUSTED_PROXIES)
+    if len(entries) < trusted:
+        return request.META.get('REMOTE_ADDR', '')
+    return entries[-trusted]
+
+
+def _identity(value):
+    return hashlib.blake2b(value.strip().lower().encode(), digest_size=12).hexdigest()
+
+
+def _scopes(request, username):
+    scopes = [('ip', _identity(client_ip(request)), settings.LOGIN_THROTTLE_IP_LIMIT)]
+    if username:
+        scopes.append(('username', _identity(username), settings.LOGIN_THROTTLE_USERNAME_LIMIT))
+    return scopes
+
+
+def _counter_keys(scope, identity, now):
+    index = int(now // settings.LOGIN_THROTTLE_WINDOW)
+    return COUNTER_KEY.format(scope, identity, index), COUNTER_KEY.format(scope, identity, index - 1)
+
+
+def _estimate(values, current, previous, now):
+    window = settings.LOGIN_THROTTLE_WINDOW
+    progress = (now % window) / window
+    return values.get(previous, 0) * (1 - progress) + values.get(current, 0)
+
+
+def check_login(request, username):
+    if not settings.LOGIN_THROTTLE_ENABLED:
+        return None
+
+    now = time.time()
+    scopes = _scopes(request, username)
+    keys = []
+    for scope, identity, limit in scopes:
+        keys += [LOCKOUT_KEY.format(scope, identity), *_counter_keys(scope, identity, now)]
+    values = cache.get_many(keys)
+
+    for scope, identity, limit in scopes:
+        locked_until = values.get(LOCKOUT_KEY.format(scope, identity))
+        if locked_until is None:
+            current, previous = _counter_keys(scope, identity, now)
+            if _estimate(values, current, previous, now) < limit:
+                continue
+
+            locked_until = now + settings.LOGIN_LOCKOUT_SECONDS
+            cache.set(LOCKOUT_KEY.format(scope, identity), locked_until, settings.LOGIN_LOCKOUT_SECONDS)
+
+        registry.inc('login_throttled_total', {'scope': scope})
+        return max(1, math.ceil(locked_until - now))
+
+    return None
+
+
+def _hit(scope, identity):
+    key = _counter_keys(scope, identity, time.time())[0]
+    timeout = settings.LOGIN_THROTTLE_WINDOW * 2
+    if not cache.add(key, 1, timeout):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout)
+
+
+def record_attempt(request):
+    if settings.LOGIN_THROTTLE_ENABLED:
+        _hit('ip', _identity(client_ip(request)))
+
+
+def record_result(username, success):
+    registry.inc('login_attempts_total', {'result': 'success' if success else 'failure'})
+    if not settings.LOGIN_THROTTLE_ENABLED or not username:
+        return
+
+    identity = _identity(username)
+    if success:
+        cache.delete_many(_counter_keys('username', identity, time.time()))
+    else:
+        _hit('username', identity)
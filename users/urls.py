@@ -4,8 +4,9 @@ from users.views import register_user, login_user, logout_user, HomeView, AboutV
     user_profile, PostsView, PostDetailView, PostCreateView, PostEditView, \
     PostDeleteView, ClubsView, ClubDetailView, join_club, leave_club, CompetitionsView, CompetitionDetailView, \
     ClubCreateView, ClubEditView, ClubDeleteView, add_competition, UserHomeView, CompetitionCreateView, \
-    CompetitionEditView, CompetitionDeleteView, BecomeStaffView, PanelView, delete_user, make_superuser, \
-    CompetitionRegisterView, RegistrationDeleteView, ClubAdminPanelView, RemoveUserFromClubView, RevokeStaffView
+    CompetitionEditView, CompetitionDeleteView, BecomeStaffView, PanelView, PanelSectionView, delete_user, \
+    make_superuser, SearchView, CompetitionRegisterView, RegistrationDeleteView, ClubAdminPanelView, ClubMembersView, RemoveUserFromClubView, \
+    RevokeStaffView, DatabasePoolStatsView, MetricsView
 
 urlpatterns = [
     path('login/', login_user, name='login'),
@@ -19,6 +20,7 @@ urlpatterns = [
     path('profile/', user_profile, name='profile'),
     path('clubs/', ClubsView.as_view(), name='clubs'),
     path('posts/', PostsView.as_view(), name='posts'),
+    path('search/', SearchView.as_view(), name='search'),
     path('post/<slug:slug>/', PostDetailView.as_view(), name='post_detail'),
     path('create-post/', PostCreateView.as_view(), name='create_post'),
     path('edit-post/<slug:slug>/', PostEditView.as_view(), name='edit_post'),
@@ -37,12 +39,36 @@ urlpatterns = [
     path('<int:competitions_id>/add/', add_competition, name='add_competition'),
     path('become-staff/', BecomeStaffView.as_view(), name="become_staff"),
     path('admin-panel', PanelView.as_view(), name='admin-panel'),
+    path('admin-panel/db-pool/', DatabasePoolStatsView.as_view(), name='admin-db-pool'),
+    path('admin-panel/metrics/', MetricsView.as_view(), name='admin-metrics'),
+    path('admin-panel/<str:section>/', PanelSectionView.as_view(), name='admin-panel-section'),
     path('delete_user/<int:user_id>/', delete_user, name='delete_user'),
     path('make_superuser/<int:user_id>/', make_superuser, name='make_superuser'),
     path('register-competition/<slug:slug>/', CompetitionRegisterView.as_view(), name='register-competition'),
     path('delete-registration/<int:pk>/', RegistrationDeleteView.as_view(), name='delete_registration'),
     path('admin-club-panel/', ClubAdminPanelView.as_view(), name='admin_club_panel'),
+    path('admin-club-panel/<int:club_id>/members/', ClubMembersView.as_view(), name='admin_club_members'),
     path('remove-user/<int:club_id>/<int:user_id>/', RemoveUserFromClubView.as_view(), name='remove_user_from_club'),
     path('revoke-staff/<int:user_id>/', RevokeStaffView.as_view(), name='revoke_staff'),
 
 ]
+
+QUERY_BUDGETS = {
+    'about': 2,
+    'user-home': 4,
+    'profile': 5,
+    'posts': 4,
+    'search': 5,
+    'post_detail': 5,
+    'clubs': 4,
+    'club_detail': 5,
+    'competitions': 4,
+    'competition_detail': 5,
+    'register-competition': 3,
+    'admin-panel': 2,
+    'admin-panel-section': 4,
+    'admin-db-pool': 2,
+    'admin-metrics': 2,
+    'admin_club_panel': 4,
+    'admin_club_members': 4,
+}
@@ -1,28 +1,43 @@
-from django.contrib.auth.mixins import LoginRequiredMixin
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import Group
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction, connection
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponse, JsonResponse
+from django.db.models import Q, Count
+from django.http import HttpResponse, JsonResponse, Http404
+from django.template.response import TemplateResponse
 from django.contrib.auth.forms import UserCreationForm
 from django.template.context_processors import request
 from django.urls import reverse_lazy
 from django.views.generic import ListView, View, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 
+from SoftUniFinalExam import metrics
+from SoftUniFinalExam.pooled_postgresql.base import pool_stats
+from SoftUniFinalExam.async_views import AsyncDetailView, AsyncListView
+from SoftUniFinalExam.pagination import KeysetPaginationMixin, paginate_keyset
+from SoftUniFinalExam.similarity import related_objects
 from SoftUniFinalExam.utils import get_user_obj
 from clubs.forms import ClubCreateForm, ClubEditForm, ClubDeleteForm
 from competitions.forms import CompetitionCreateForm, CompetitionEditForm, CompetitionDeleteForm
 from competitions.models import Competitions
 from posts.forms import PostCreateForm, PostsEditForm, PostDeleteForm
 from posts.models import Post
+from clubs import membership
 from clubs.models import Club
 from registration.forms import RegisterBaseForm
+from registration import admission
 from registration.models import Registration
-from .decorators import unauthenticated_user, allowed_users, AllowedUsersMixin
+from search.backends import search
+from .decorators import unauthenticated_user, allowed_users, async_login_required, AllowedUsersMixin, \
+    LoginRequiredMixin
 from .forms import CreateUserForm, ProfileUpdateForm
+from .profiles import ProfileFormMixin, aget_profile, get_profile
+from . import throttling
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
 
 from users.models import *
 
@@ -38,15 +53,19 @@ class AboutView(ListView):
     template_name = 'public/about-me.html'
 
 
-class PostsView(LoginRequiredMixin, AllowedUsersMixin, ListView):
+class PostsView(LoginRequiredMixin, AllowedUsersMixin, KeysetPaginationMixin, AsyncListView):
     model = Post
     template_name = 'user/posts.html'
     context_object_name = 'posts'
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
+    keyset_ordering = ('-uploaded_at', '-id')
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
 
-class PostDetailView(LoginRequiredMixin, AllowedUsersMixin, DetailView):
+
+class PostDetailView(LoginRequiredMixin, AllowedUsersMixin, AsyncDetailView):
     model = Post
     template_name = 'Posts/post_detail.html'
     context_object_name = 'post'
@@ -55,16 +74,38 @@ class PostDetailView(LoginRequiredMixin, AllowedUsersMixin, DetailView):
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        related_posts = Post.objects.exclude(id=self.object.id)[:4]
+        related_posts = related_objects(self.object)
         context['related_posts'] = related_posts
 
         return context
 
 
-class PostCreateView(LoginRequiredMixin, AllowedUsersMixin, CreateView):
+class SearchView(LoginRequiredMixin, AllowedUsersMixin, View):
+    template_name = 'user/search.html'
+    login_url = 'login'
+    allowed_roles = ['admin', 'staff', 'user']
+    page_size = 10
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '').strip()
+        paginator = Paginator(search(query), self.page_size)
+        page = paginator.get_page(request.GET.get('page'))
+
+        context = {
+            'query': query,
+            'page_obj': page,
+            'results': page.object_list,
+        }
+        return render(request, self.template_name, context)
+
+
+class PostCreateView(LoginRequiredMixin, AllowedUsersMixin, ProfileFormMixin, CreateView):
     model = Post
     form_class = PostCreateForm
     template_name = 'Posts/post_create.html'
@@ -73,18 +114,8 @@ class PostCreateView(LoginRequiredMixin, AllowedUsersMixin, CreateView):
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
 
-    def form_valid(self, form):
-        logged_in_user = self.request.user
-        try:
-            custom_user = Users.objects.get(user=logged_in_user)
-        except Users.DoesNotExist:
-            raise ValueError("No corresponding Users instance found for the logged-in user.")
-
-        form.instance.user = custom_user
-        return super().form_valid(form)
 
-
-class PostEditView(LoginRequiredMixin, AllowedUsersMixin, UpdateView):
+class PostEditView(LoginRequiredMixin, AllowedUsersMixin, ProfileFormMixin, UpdateView):
     model = Post
     form_class = PostsEditForm
     template_name = 'Posts/post_edit.html'
@@ -93,16 +124,6 @@ class PostEditView(LoginRequiredMixin, AllowedUsersMixin, UpdateView):
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
 
-    def form_valid(self, form):
-        logged_in_user = self.request.user
-        try:
-            custom_user = Users.objects.get(user=logged_in_user)
-        except Users.DoesNotExist:
-            raise ValueError("No corresponding Users instance found for the logged-in user.")
-
-        form.instance.user = custom_user
-        return super().form_valid(form)
-
 
 class PostDeleteView(LoginRequiredMixin, AllowedUsersMixin, DeleteView):
     model = Post
@@ -120,15 +141,19 @@ class PostDeleteView(LoginRequiredMixin, AllowedUsersMixin, DeleteView):
         return self.form_valid(form)
 
 
-class ClubsView(LoginRequiredMixin, AllowedUsersMixin, ListView):
+class ClubsView(LoginRequiredMixin, AllowedUsersMixin, KeysetPaginationMixin, AsyncListView):
     model = Club
     template_name = 'user/clubs.html'
     context_object_name = 'clubs'
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
+    keyset_ordering = ('-uploaded_at', '-id')
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
 
 
-class ClubDetailView(LoginRequiredMixin, AllowedUsersMixin, DetailView):
+class ClubDetailView(LoginRequiredMixin, AllowedUsersMixin, AsyncDetailView):
     model = Club
     template_name = 'Clubs/club_details.html'
     context_object_name = 'club'
@@ -140,13 +165,13 @@ class ClubDetailView(LoginRequiredMixin, AllowedUsersMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        related_clubs = Club.objects.exclude(id=self.object.id)[:4]
+        related_clubs = related_objects(self.object)
         context['related_clubs'] = related_clubs
 
         return context
 
 
-class ClubCreateView(LoginRequiredMixin, AllowedUsersMixin, CreateView):
+class ClubCreateView(LoginRequiredMixin, AllowedUsersMixin, ProfileFormMixin, CreateView):
     model = Club
     form_class = ClubCreateForm
     template_name = 'Clubs/club_create.html'
@@ -155,18 +180,8 @@ class ClubCreateView(LoginRequiredMixin, AllowedUsersMixin, CreateView):
     login_url = 'login'
     allowed_roles = ['admin', 'staff']
 
-    def form_valid(self, form):
-        logged_in_user = self.request.user
-        try:
-            custom_user = Users.objects.get(user=logged_in_user)
-        except Users.DoesNotExist:
-            raise ValueError("No corresponding Users instance found for the logged-in user.")
-
-        form.instance.user = custom_user
-        return super().form_valid(form)
 
-
-class ClubEditView(LoginRequiredMixin, AllowedUsersMixin, UpdateView):
+class ClubEditView(LoginRequiredMixin, AllowedUsersMixin, ProfileFormMixin, UpdateView):
     model = Club
     form_class = ClubEditForm
     template_name = 'Clubs/club_edit.html'
@@ -175,16 +190,6 @@ class ClubEditView(LoginRequiredMixin, AllowedUsersMixin, UpdateView):
     login_url = 'login'
     allowed_roles = ['admin', 'staff']
 
-    def form_valid(self, form):
-        logged_in_user = self.request.user
-        try:
-            custom_user = Users.objects.get(user=logged_in_user)
-        except Users.DoesNotExist:
-            raise ValueError("No corresponding Users instance found for the logged-in user.")
-
-        form.instance.user = custom_user
-        return super().form_valid(form)
-
 
 class ClubDeleteView(LoginRequiredMixin, AllowedUsersMixin, DeleteView):
     model = Club
@@ -206,37 +211,17 @@ class ClubDeleteView(LoginRequiredMixin, AllowedUsersMixin, DeleteView):
 @allowed_users(allowed_roles=['admin', 'staff', 'user'])
 def join_club(request, club_id):
     club = get_object_or_404(Club, id=club_id)
-    user_id = request.user.id
-
-    with connection.cursor() as cursor:
-        cursor.execute(
-            "SELECT 1 FROM clubs_club_members WHERE club_id = %s AND user_id = %s",
-            [club_id, user_id]
-        )
-        is_member_of_current_club = cursor.fetchone()
+    status = membership.join_club(request.user.id, club.id, switch='switch' in request.POST)
 
-    if is_member_of_current_club:
+    if status == membership.ALREADY_MEMBER:
         messages.info(request, "You are already a member of this club!")
+    elif status == membership.IN_OTHER_CLUB:
+        messages.error(
+            request,
+            f"You are already a member of another club. Leave it before joining a new one."
+        )
     else:
-        with connection.cursor() as cursor:
-            cursor.execute(
-                "SELECT club_id FROM clubs_club_members WHERE user_id = %s",
-                [user_id]
-            )
-            other_club = cursor.fetchone()
-
-        if other_club:
-            messages.error(
-                request,
-                f"You are already a member of another club. Leave it before joining a new one."
-            )
-        else:
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    "INSERT INTO clubs_club_members (club_id, user_id) VALUES (%s, %s)",
-                    [club_id, user_id]
-                )
-            messages.success(request, "You have successfully joined the club!")
+        messages.success(request, "You have successfully joined the club!")
 
     return redirect('club_detail', club.slug)
 
@@ -244,28 +229,26 @@ def join_club(request, club_id):
 @login_required(login_url='login')
 @allowed_users(allowed_roles=['admin', 'user', 'staff'])
 def leave_club(request):
-    user_id = request.user.id
-
-    with connection.cursor() as cursor:
-        cursor.execute(
-            "DELETE FROM clubs_club_members WHERE user_id = %s",
-            [user_id]
-        )
+    membership.leave_club(request.user.id)
 
     messages.success(request, "You have successfully left the club!")
 
     return redirect('profile')
 
 
-class CompetitionsView(LoginRequiredMixin, AllowedUsersMixin, ListView):
+class CompetitionsView(LoginRequiredMixin, AllowedUsersMixin, KeysetPaginationMixin, AsyncListView):
     model = Competitions
     template_name = 'user/competitions.html'
     context_object_name = 'competitions'
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
+    keyset_ordering = ('date', 'id')
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('club')
 
-class CompetitionDetailView(LoginRequiredMixin, AllowedUsersMixin, DetailView):
+
+class CompetitionDetailView(LoginRequiredMixin, AllowedUsersMixin, AsyncDetailView):
     model = Competitions
     template_name = 'Competitions/competition_details.html'
     context_object_name = 'competitions'
@@ -274,10 +257,13 @@ class CompetitionDetailView(LoginRequiredMixin, AllowedUsersMixin, DetailView):
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('club')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        related_competitions = Competitions.objects.exclude(id=self.object.id)[:4]
+        related_competitions = related_objects(self.object)
         context['related_competitions'] = related_competitions
 
         return context
@@ -292,16 +278,6 @@ class CompetitionCreateView(LoginRequiredMixin, AllowedUsersMixin, CreateView):
     login_url = 'login'
     allowed_roles = ['admin', 'staff']
 
-    def form_valid(self, form):
-        logged_in_user = self.request.user
-        try:
-            custom_user = Users.objects.get(user=logged_in_user)
-        except Users.DoesNotExist:
-            raise ValueError("No corresponding Users instance found for the logged-in user.")
-
-        form.instance.user = custom_user
-        return super().form_valid(form)
-
 
 class CompetitionEditView(LoginRequiredMixin, AllowedUsersMixin, UpdateView):
     model = Competitions
@@ -313,14 +289,9 @@ class CompetitionEditView(LoginRequiredMixin, AllowedUsersMixin, UpdateView):
     allowed_roles = ['admin', 'staff']
 
     def form_valid(self, form):
-        logged_in_user = self.request.user
-        try:
-            custom_user = Users.objects.get(user=logged_in_user)
-        except Users.DoesNotExist:
-            raise ValueError("No corresponding Users instance found for the logged-in user.")
-
-        form.instance.user = custom_user
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        admission.promote_waitlist(self.object.pk)
+        return response
 
 
 class CompetitionDeleteView(LoginRequiredMixin, AllowedUsersMixin, DeleteView):
@@ -359,20 +330,17 @@ class CompetitionRegisterView(LoginRequiredMixin, AllowedUsersMixin, CreateView)
             form.add_error(None, "Competition does not exist.")
             return self.form_invalid(form)
 
-        response = super().form_valid(form)
-
-        from django.db import connection
         try:
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    "DELETE FROM competitions_competitions_participants WHERE user_id = %s AND competitions_id = %s",
-                    [self.request.user.id, competition.id]
-                )
-        except Exception as e:
-            print(f"Error deleting row: {e}")
-
-        messages.success(self.request, f"You have successfully registered for the competition: {competition.title}")
-        return response
+            registration = admission.register(form.instance)
+        except admission.AlreadyRegistered:
+            messages.info(self.request, f"You are already registered for the competition: {competition.title}")
+            return redirect(self.success_url)
+
+        if registration.status == Registration.Status.WAITLISTED:
+            messages.info(self.request, f"{competition.title} is full. You have been added to the waitlist.")
+        else:
+            messages.success(self.request, f"You have successfully registered for the competition: {competition.title}")
+        return redirect(self.success_url)
 
 
 class RegistrationDeleteView(LoginRequiredMixin, AllowedUsersMixin, View):
@@ -382,7 +350,7 @@ class RegistrationDeleteView(LoginRequiredMixin, AllowedUsersMixin, View):
     def post(self, request, pk, *args, **kwargs):
         registration = get_object_or_404(Registration, pk=pk)
 
-        registration.delete()
+        admission.withdraw(registration)
 
         messages.success(request,
                          f"Registration for {registration.first_name} {registration.last_name} has been successfully reviewed.")
@@ -416,71 +384,76 @@ def add_competition(request, competitions_id):
     return redirect('competition_detail', competition.slug)
 
 
-class UserHomeView(LoginRequiredMixin, AllowedUsersMixin, ListView):
+class UserHomeView(LoginRequiredMixin, AllowedUsersMixin, AsyncListView):
     model = Post
     template_name = 'user/user-page.html'
     context_object_name = 'posts'
     login_url = 'login'
     allowed_roles = ['admin', 'staff', 'user']
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
 
-        posts = Post.objects.all().order_by('uploaded_at')[:4]
+        posts = [post async for post in Post.objects.all().order_by('uploaded_at')[:4]]
         context['posts'] = posts
 
         return context
 
 
-@login_required(login_url='login')
-def user_profile(request):
+@async_login_required(login_url='login')
+async def user_profile(request):
+    if request.method == 'POST':
+        return await sync_to_async(update_profile)(request)
+
     user = request.user
-    try:
-        profile = user.users
-    except Users.DoesNotExist:
-        profile = Users.objects.create(
-            user=user,
-            first_name=user.first_name or "",
-            last_name=user.last_name or "",
-            email=user.email or f"default_email_{user.pk}@example.com",
-            phone="",
-            info="",
-        )
+    profile = await aget_profile(user) or Users(user=user, **profile_defaults(user))
 
-    user_id = request.user.id
-    user_clubs = Club.objects.filter(members=user_id)
-    user_competitions = Competitions.objects.filter(participants=user_id)
+    context = {
+        'form': ProfileUpdateForm(instance=user),
+        'profile': profile,
+        'user_clubs': [club async for club in Club.objects.filter(members=user.id)],
+        'user_competitions': [
+            competition async for competition in Competitions.objects.filter(participants=user.id)
+        ],
+    }
+    return TemplateResponse(request, 'user/user-profile.html', context)
 
-    if request.method == 'POST':
-        if 'leave_club' in request.POST:
-            user_id = request.user.id
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    "DELETE FROM clubs_club_members WHERE user_id = %s",
-                    [user_id]
-                )
-        else:
-            form = ProfileUpdateForm(request.POST, instance=user)
-            if form.is_valid():
-                user = form.save()
-                profile.phone = request.POST.get('phone', profile.phone)
-                profile.info = request.POST.get('info', profile.info)
-                profile.first_name = user.first_name
-                profile.last_name = user.last_name
-                profile.email = user.email
-                profile.save()
-                messages.success(request, "Profile updated successfully!")
-                return redirect('profile')
 
+def profile_defaults(user):
+    return {
+        'first_name': user.first_name or "",
+        'last_name': user.last_name or "",
+        'email': user.email or f"default_email_{user.pk}@example.com",
+        'phone': "",
+        'info': "",
+    }
 
-    else:
-        form = ProfileUpdateForm(instance=user)
+
+def update_profile(request):
+    user = request.user
+    profile = get_profile(user) or Users.objects.create(user=user, **profile_defaults(user))
+
+    if 'leave_club' in request.POST:
+        membership.leave_club(user.id)
+        return redirect('profile')
+
+    form = ProfileUpdateForm(request.POST, instance=user)
+    if form.is_valid():
+        user = form.save()
+        profile.phone = request.POST.get('phone', profile.phone)
+        profile.info = request.POST.get('info', profile.info)
+        profile.first_name = user.first_name
+        profile.last_name = user.last_name
+        profile.email = user.email
+        profile.save()
+        messages.success(request, "Profile updated successfully!")
+        return redirect('profile')
 
     context = {
         'form': form,
         'profile': profile,
-        'user_clubs': user_clubs,
-        'user_competitions': user_competitions,
+        'user_clubs': Club.objects.filter(members=user.id),
+        'user_competitions': Competitions.objects.filter(participants=user.id),
     }
     return render(request, 'user/user-profile.html', context)
 
@@ -560,7 +533,17 @@ def login_user(request):
     if request.method == 'POST':
         username = request.POST.get('username')
         password = request.POST.get('password')
+
+        retry_after = throttling.check_login(request, username)
+        if retry_after:
+            messages.error(request, "Too many login attempts. Please try again later.")
+            response = render(request, 'user/login-user.html', status=429)
+            response['Retry-After'] = str(retry_after)
+            return response
+
+        throttling.record_attempt(request)
         user = authenticate(request, username=username, password=password)
+        throttling.record_result(username, success=user is not None)
 
         if user is not None:
             login(request, user)
@@ -579,20 +562,93 @@ def logout_user(request):
     return redirect('home')
 
 
+class DatabasePoolStatsView(LoginRequiredMixin, AllowedUsersMixin, View):
+    login_url = 'login'
+    allowed_roles = ['admin']
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({
+            'mode': settings.DB_CONN_MODE,
+            'pools': pool_stats(),
+        })
+
+
+class MetricsView(LoginRequiredMixin, AllowedUsersMixin, View):
+    login_url = 'login'
+    allowed_roles = ['admin', 'staff']
+
+    def get(self, request, *args, **kwargs):
+        body = metrics.render(metrics.registry.snapshots(), settings.METRICS_GAUGE_MAX_AGE)
+        return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 class PanelView(LoginRequiredMixin, AllowedUsersMixin, TemplateView):
     model = User
     login_url = 'login'
     allowed_roles = ['admin', 'staff']
     template_name = 'Admins/admin_panel.html'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['users'] = User.objects.all()
-        context['posts'] = Post.objects.all()
-        context['competitions'] = Competitions.objects.all()
-        context['clubs'] = Club.objects.all()
-        context['registrations'] = Registration.objects.all()
-        return context
+
+class PanelSectionView(LoginRequiredMixin, AllowedUsersMixin, View):
+    login_url = 'login'
+    allowed_roles = ['admin', 'staff']
+    page_size = 20
+    sections = {
+        'users': {
+            'model': User,
+            'fields': ('id', 'username', 'is_staff', 'is_superuser'),
+            'search_fields': ('username__icontains',),
+            'ordering': ('-id',),
+        },
+        'posts': {
+            'model': Post,
+            'fields': ('id', 'title', 'slug'),
+            'search_fields': ('title__icontains',),
+            'ordering': ('-id',),
+        },
+        'competitions': {
+            'model': Competitions,
+            'fields': ('id', 'title', 'slug'),
+            'search_fields': ('title__icontains',),
+            'ordering': ('-id',),
+        },
+        'clubs': {
+            'model': Club,
+            'fields': ('id', 'title', 'slug'),
+            'search_fields': ('title__icontains',),
+            'ordering': ('-id',),
+        },
+        'registrations': {
+            'model': Registration,
+            'fields': ('id', 'first_name', 'last_name', 'age', 'competition', 'user', 'status'),
+            'search_fields': ('first_name__icontains', 'last_name__icontains'),
+            'ordering': ('id',),
+        },
+    }
+
+    def get(self, request, section, *args, **kwargs):
+        if section not in self.sections:
+            raise Http404("Unknown admin panel section.")
+
+        config = self.sections[section]
+        queryset = config['model'].objects.only(*config['fields'])
+
+        query = request.GET.get('q', '').strip()
+        if query:
+            condition = Q()
+            for lookup in config['search_fields']:
+                condition |= Q(**{lookup: query})
+            queryset = queryset.filter(condition)
+
+        page = paginate_keyset(
+            queryset,
+            config['ordering'],
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+            page_size=self.page_size,
+        )
+
+        return render(request, f'Admins/panel_sections/{section}.html', {'page_obj': page})
 
 
 class ClubAdminPanelView(LoginRequiredMixin, AllowedUsersMixin, View):
@@ -600,13 +656,50 @@ class ClubAdminPanelView(LoginRequiredMixin, AllowedUsersMixin, View):
     allowed_roles = ['admin', 'staff']
     login_url = 'login'
 
+    page_size = 20
+
     def get(self, request, *args, **kwargs):
-        clubs = Club.objects.prefetch_related(
-            'members'
+        clubs = Club.objects.only('id', 'title').annotate(member_count=Count('members'))
+        page = paginate_keyset(
+            clubs,
+            ('title', 'id'),
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+            page_size=self.page_size,
+        )
+
+        context = {
+            'clubs': page,
+            'page_obj': page,
+            'is_paginated': page.has_next or page.has_previous,
+        }
+        return render(request, self.template_name, context)
+
+
+class ClubMembersView(LoginRequiredMixin, AllowedUsersMixin, View):
+    template_name = 'Admins/club_members.html'
+    allowed_roles = ['admin', 'staff']
+    login_url = 'login'
+    page_size = 25
+
+    def get(self, request, club_id, *args, **kwargs):
+        members = User.objects.filter(joined_clubs=club_id).only('id', 'username')
+
+        query = request.GET.get('q', '').strip()
+        if query:
+            members = members.filter(username__icontains=query)
+
+        page = paginate_keyset(
+            members,
+            ('username', 'id'),
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+            page_size=self.page_size,
         )
 
         context = {
-            'clubs': clubs
+            'club_id': club_id,
+            'page_obj': page,
         }
         return render(request, self.template_name, context)
 
@@ -619,7 +712,13 @@ class RemoveUserFromClubView(LoginRequiredMixin, AllowedUsersMixin, View):
         club = get_object_or_404(Club, id=club_id)
         user = get_object_or_404(User, id=user_id)
 
-        club.members.remove(user)
+        membership.leave_club(user.id, club.id)
+
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+            return JsonResponse({
+                'removed': user.id,
+                'member_count': club.members.count(),
+            })
 
         messages.success(request, f"{user.username} has been removed from {club.title}.")
 